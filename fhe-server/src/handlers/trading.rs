@@ -124,6 +124,31 @@ pub struct CheckShortStrategyRequest {
     value: u8,
 }
 
+#[derive(Deserialize)]
+pub struct StrategyCheck {
+    strategy_id: u128,
+    side: String, // "long" or "short"
+    value: u8,
+}
+
+#[derive(Deserialize)]
+pub struct CheckBatchRequest {
+    checks: Vec<StrategyCheck>,
+}
+
+#[derive(Serialize)]
+pub struct StrategyCheckResult {
+    strategy_id: u128,
+    side: String,
+    value: u8,
+    triggered: Option<bool>, // null when the strategy doesn't exist or the side is unknown
+}
+
+#[derive(Serialize)]
+pub struct CheckBatchResponse {
+    results: Vec<StrategyCheckResult>,
+}
+
 #[derive(Deserialize)]
 pub struct OpenTradeRequest {
     strategy_id: u128,
@@ -204,6 +229,28 @@ pub async fn check_short_strategy_handler(State(state): State<AppState>, Json(pa
     Ok(format!("Result: {}", result_decrypted))
 }
 
+pub async fn check_batch_handler(State(state): State<AppState>, Json(payload): Json<CheckBatchRequest>) -> Json<CheckBatchResponse> {
+    let trading_state = state.trading_state.lock().unwrap();
+    // Install the server key once for the whole batch instead of once per check
+    set_server_key((*state.server_key).clone());
+    let results = payload.checks.into_iter().map(|check| {
+        // Validate the side before encrypting, so an unknown side costs no FHE work
+        let is_long = match check.side.as_str() {
+            "long" => true,
+            "short" => false,
+            _ => return StrategyCheckResult { strategy_id: check.strategy_id, side: check.side, value: check.value, triggered: None },
+        };
+        let triggered = trading_state.get_strategy(check.strategy_id).ok().map(|strategy| {
+            let value = FheUint8::encrypt(check.value, &*state.client_key);
+            let result = if is_long { strategy.lower_bound.gt(&value) } else { strategy.upper_bound.lt(&value) };
+            let result_decrypted: bool = result.decrypt(&*state.client_key);
+            result_decrypted
+        });
+        StrategyCheckResult { strategy_id: check.strategy_id, side: check.side, value: check.value, triggered }
+    }).collect();
+    Json(CheckBatchResponse { results })
+}
+
 pub async fn open_trade_handler(State(state): State<AppState>, Json(payload): Json<OpenTradeRequest>) -> Result<String, (StatusCode, String)> {
     let mut trading_state = state.trading_state.lock().unwrap();
     let strategy = match trading_state.get_strategy(payload.strategy_id) {
@@ -78,6 +78,7 @@ async fn main() {
         .route("/create_strategy", post(handlers::trading::create_strategy_handler))
         .route("/check_long_strategy", post(handlers::trading::check_long_strategy_handler))
         .route("/check_short_strategy", post(handlers::trading::check_short_strategy_handler))
+        .route("/check_batch", post(handlers::trading::check_batch_handler))
         .route("/get_strategy/:id", get(handlers::trading::get_strategy_handler))
         .route("/get_all_strategies", get(handlers::trading::get_all_strategies_handler))
         .route("/create_account", post(handlers::account::create_account_handler))
@@ -1,5 +1,9 @@
-import json
-from flask import Flask, jsonify, request
+import hashlib
+import orjson
+import threading
+from flask import Blueprint, Flask, current_app, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
 from flask_cors import CORS
 import example_utils
 from hyperliquid.utils import constants
@@ -16,63 +20,110 @@ logging.basicConfig(
 )
 logger = logging.getLogger("PnL_API")
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-@app.route('/api/pnl', methods=['GET'])
+api = Blueprint('api', __name__)
+cache = Cache()
+
+# Seconds a PnL snapshot is reused, so bursts of UI polling share one Hyperliquid call
+PNL_CACHE_TIMEOUT = 2
+
+# Cache-Control headers for downstream (browser/proxy) caches
+PNL_CACHE_CONTROL = f"public, max-age={PNL_CACHE_TIMEOUT}, stale-while-revalidate=5"
+PERFORMANCE_CACHE_CONTROL = "public, max-age=60"  # Mock data is static
+
+# Hyperliquid connection, set up once per worker process on first use
+_exchange_setup = None
+_exchange_lock = threading.Lock()
+
+def get_exchange():
+    """Get the (address, info, exchange) connection, creating it on first use"""
+    global _exchange_setup
+    with _exchange_lock:
+        if _exchange_setup is None:
+            _exchange_setup = example_utils.setup(constants.TESTNET_API_URL, skip_ws=True)
+            logger.info(f"Connected to exchange with account: {_exchange_setup[0]}")
+        return _exchange_setup
+
+def _build_position(position):
+    """Convert a Hyperliquid position into the API's position format"""
+    size = float(position.get("szi", 0))
+    return {
+        "coin": position.get("coin", ""),
+        "direction": "LONG" if size > 0 else "SHORT",
+        "size": abs(size),
+        "entry_price": float(position.get("entryPx", 0)),
+        "position_value": float(position.get("positionValue", 0)),
+        "unrealized_pnl": float(position.get("unrealizedPnl", 0)),
+        "roe": float(position.get("returnOnEquity", 0)) * 100,  # Convert to percentage
+        "leverage": (position.get("leverage") or {}).get("value", 0)
+    }
+
+def json_body(payload):
+    """Serialized JSON body and its (weak) ETag"""
+    body = orjson.dumps(payload)
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+@cache.memoize(timeout=PNL_CACHE_TIMEOUT)
+def load_pnl():
+    """Fetch the account state from Hyperliquid and build the serialized PnL summary and its ETag"""
+    address, info, exchange = get_exchange()
+    
+    # Get user state using the correct method
+    user_state = exchange.get_user_state_by_address(address)
+    
+    # Process the data
+    margin_summary = user_state.get("marginSummary", {})
+    account_value = float(margin_summary.get("accountValue", 0))
+    total_margin_used = float(margin_summary.get("totalMarginUsed", 0))
+    result = {
+        "account_summary": {
+            "account_value": account_value,
+            "total_margin_used": total_margin_used,
+            "available_margin": account_value - total_margin_used,
+            "withdrawable": float(user_state.get("withdrawable", 0))
+        },
+        "positions": [
+            _build_position(asset_pos["position"])
+            for asset_pos in user_state.get("assetPositions", [])
+            if asset_pos.get("type") == "oneWay" and "position" in asset_pos
+        ]
+    }
+    
+    return json_body(result)
+
+def conditional_json_response(payload, cache_control):
+    """JSON response with a weak ETag; answers 304 when the client already has it"""
+    return conditional_body_response(*json_body(payload), cache_control)
+
+def conditional_body_response(body, etag, cache_control):
+    """Response for a prebuilt JSON body and its ETag; answers 304 when the client already has it"""
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+@api.route('/api/pnl', methods=['GET'])
 def get_pnl():
     """Get PnL data for the account"""
     try:
-        # Setup connection to Hyperliquid
-        address, info, exchange = example_utils.setup(constants.TESTNET_API_URL, skip_ws=True)
-        logger.info(f"Connected to exchange with account: {address}")
-        
-        # Get user state using the correct method
-        user_state = exchange.get_user_state_by_address(address)
-        
-        # Process the data
-        result = {
-            "account_summary": {
-                "account_value": float(user_state.get("marginSummary", {}).get("accountValue", 0)),
-                "total_margin_used": float(user_state.get("marginSummary", {}).get("totalMarginUsed", 0)),
-                "available_margin": float(user_state.get("marginSummary", {}).get("accountValue", 0)) - float(user_state.get("marginSummary", {}).get("totalMarginUsed", 0)),
-                "withdrawable": float(user_state.get("withdrawable", 0))
-            },
-            "positions": []
-        }
-        
-        # Process positions
-        asset_positions = user_state.get("assetPositions", [])
-        for asset_pos in asset_positions:
-            if asset_pos.get("type") == "oneWay" and "position" in asset_pos:
-                position = asset_pos["position"]
-                coin = position.get("coin", "")
-                size = float(position.get("szi", 0))
-                direction = "LONG" if size > 0 else "SHORT"
-                entry_price = float(position.get("entryPx", 0))
-                position_value = float(position.get("positionValue", 0))
-                unrealized_pnl = float(position.get("unrealizedPnl", 0))
-                roe = float(position.get("returnOnEquity", 0)) * 100  # Convert to percentage
-                leverage = position.get("leverage", {}).get("value", 0)
-                
-                pos_data = {
-                    "coin": coin,
-                    "direction": direction,
-                    "size": abs(size),
-                    "entry_price": entry_price,
-                    "position_value": position_value,
-                    "unrealized_pnl": unrealized_pnl,
-                    "roe": roe,
-                    "leverage": leverage
-                }
-                result["positions"].append(pos_data)
-        
-        return jsonify(result)
+        body, etag = load_pnl()
+        return conditional_body_response(body, etag, PNL_CACHE_CONTROL)
     except Exception as e:
         logger.error(f"Error getting PnL data: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/strategies/performance', methods=['GET'])
+@api.route('/api/strategies/performance', methods=['GET'])
 def get_strategies_performance():
     """Get performance data for strategies"""
     try:
@@ -109,10 +160,22 @@ def get_strategies_performance():
             }
         ]
         
-        return jsonify(strategies)
+        return conditional_json_response(strategies, PERFORMANCE_CACHE_CONTROL)
     except Exception as e:
         logger.error(f"Error getting strategy performance: {e}")
         return jsonify({"error": str(e)}), 500
 
+def create_app():
+    """Create and configure the Flask application"""
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    CORS(app)  # Enable CORS for all routes
+    cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    app.register_blueprint(api)
+    return app
+
+app = create_app()
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs under gunicorn (see Dockerfile)
+    app.run(host='0.0.0.0', port=5000)
@@ -1,7 +1,7 @@
 import example_utils
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
-import json
+import orjson
 
 # Initialize the Info client
 info = Info(constants.TESTNET_API_URL, skip_ws=True)
@@ -12,31 +12,38 @@ user_state = info.user_state(user_address)
 
 # Print the full user state
 print("Full user state:")
-print(json.dumps(user_state, indent=2))
+print(orjson.dumps(user_state, option=orjson.OPT_INDENT_2).decode())
+
+# Index one-way positions by coin so each asset lookup is a dict access
+def index_positions(user_state):
+    return {
+        position['position'].get('coin'): position['position']
+        for position in user_state.get('assetPositions', [])
+        if position.get('type') == 'oneWay' and 'position' in position
+    }
 
 # Function to get PnL for a specific asset
-def get_asset_pnl(user_state, asset_name):
-    if 'assetPositions' in user_state:
-        for position in user_state['assetPositions']:
-            if position['type'] == 'oneWay' and 'position' in position:
-                pos_data = position['position']
-                if pos_data.get('coin') == asset_name:
-                    return {
-                        'asset': asset_name,
-                        'size': float(pos_data.get('szi', '0')),
-                        'entry_price': float(pos_data.get('entryPx', '0')),
-                        'position_value': float(pos_data.get('positionValue', '0')),
-                        'unrealized_pnl': float(pos_data.get('unrealizedPnl', '0')),
-                        'return_on_equity': float(pos_data.get('returnOnEquity', '0')),
-                        'leverage': pos_data.get('leverage', {}).get('value', 1),
-                        'is_long': float(pos_data.get('szi', '0')) > 0
-                    }
-    return None
+def get_asset_pnl(positions_by_coin, asset_name):
+    pos_data = positions_by_coin.get(asset_name)
+    if pos_data is None:
+        return None
+    size = float(pos_data.get('szi', '0'))
+    return {
+        'asset': asset_name,
+        'size': size,
+        'entry_price': float(pos_data.get('entryPx', '0')),
+        'position_value': float(pos_data.get('positionValue', '0')),
+        'unrealized_pnl': float(pos_data.get('unrealizedPnl', '0')),
+        'return_on_equity': float(pos_data.get('returnOnEquity', '0')),
+        'leverage': pos_data.get('leverage', {}).get('value', 1),
+        'is_long': size > 0
+    }
 
 # Extract PnL information for specific assets
+positions_by_coin = index_positions(user_state)
 assets_to_check = ['ETH', 'BTC', 'SOL']
 for asset in assets_to_check:
-    pnl_data = get_asset_pnl(user_state, asset)
+    pnl_data = get_asset_pnl(positions_by_coin, asset)
     if pnl_data:
         print(f"\n{asset} Position:")
         print(f"Direction: {'LONG' if pnl_data['is_long'] else 'SHORT'}")
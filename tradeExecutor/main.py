@@ -1,21 +1,40 @@
 import example_utils
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
+import math
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import random
-import statistics
-from datetime import datetime
+import re
+import asyncio
+import atexit
+import threading
+import aiohttp
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from hyperliquid.utils import constants
 
-# Configure logging
+# Configure logging: records are queued and written by a listener thread so
+# file/console I/O stays off the trading loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler("trade_executor.log", delay=True),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("trade_executor.log"),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',  # Full formatting happens on the listener's handlers
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("TradeExecutor")
 
@@ -23,10 +42,22 @@ logger = logging.getLogger("TradeExecutor")
 import os
 FHE_SERVER_URL = os.environ.get("FHE_SERVER_URL", "http://localhost:3000")
 
+# Shared session so FHE server requests reuse keep-alive connections. The pool is
+# sized for the concurrent strategy checks; connection failures are retried briefly.
+fhe_session = requests.Session()
+_fhe_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                           max_retries=Retry(total=2, backoff_factor=0.1))
+fhe_session.mount("http://", _fhe_adapter)
+fhe_session.mount("https://", _fhe_adapter)
+
 # Redstone Oracle configuration
 REDSTONE_API_URL = "https://api.redstone.finance/prices"
 PRICE_HISTORY_COUNT = 15  # Number of price points to collect
 PRICE_INTERVAL = 0.5  # Time between price checks in seconds
+REDSTONE_PROVIDER = "redstone"
+# Fetch the whole price window with one historical query; set PRICE_BATCH_FETCH=0
+# to fall back to sampling the live price PRICE_HISTORY_COUNT times (debugging)
+PRICE_BATCH_FETCH = os.environ.get("PRICE_BATCH_FETCH", "1") != "0"
 
 # Map of tokens to their Redstone symbols
 TOKEN_SYMBOL_MAP = {
@@ -38,53 +69,110 @@ TOKEN_SYMBOL_MAP = {
     "DOGE": "DOGE"
 }
 
+# Persistent event loop (run on a background thread) and keep-alive session used
+# for the concurrent Redstone requests
+_price_loop = None
+_price_loop_lock = threading.Lock()
+_price_session = None
+
+def _get_price_loop():
+    """Return the background event loop used for price fetches, starting it on first use"""
+    global _price_loop
+    with _price_loop_lock:
+        if _price_loop is None:
+            _price_loop = asyncio.new_event_loop()
+            threading.Thread(target=_price_loop.run_forever, name="price-fetch", daemon=True).start()
+            atexit.register(_close_price_session)
+        return _price_loop
+
+def _close_price_session():
+    """Close the shared aiohttp session on interpreter shutdown"""
+    if _price_session is not None and not _price_session.closed:
+        asyncio.run_coroutine_threadsafe(_price_session.close(), _price_loop).result(timeout=5)
+
+async def _get_price_session():
+    """Return the shared aiohttp session (only ever called on the price loop)"""
+    global _price_session
+    if _price_session is None or _price_session.closed:
+        connector = aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=30)
+        _price_session = aiohttp.ClientSession(connector=connector)
+    return _price_session
+
+async def _fetch_price_point(session, url, delay):
+    """Fetch a single price sample from Redstone after waiting `delay` seconds"""
+    if delay:
+        await asyncio.sleep(delay)
+    async with session.get(url) as response:
+        response.raise_for_status()
+        price_data = orjson.loads(await response.read())
+    if not price_data or len(price_data) == 0:
+        return None
+    return price_data[0]['value']
+
+async def _fetch_price_points(url):
+    """Fetch PRICE_HISTORY_COUNT samples concurrently, spaced PRICE_INTERVAL apart"""
+    session = await _get_price_session()
+    return await asyncio.gather(*[
+        _fetch_price_point(session, url, i * PRICE_INTERVAL)
+        for i in range(PRICE_HISTORY_COUNT)
+    ])
+
+async def _fetch_price_history(url):
+    """Fetch the last PRICE_HISTORY_COUNT prices in a single request, oldest first"""
+    session = await _get_price_session()
+    async with session.get(url) as response:
+        response.raise_for_status()
+        price_data = orjson.loads(await response.read())
+    price_data.sort(key=lambda point: point.get('timestamp', 0))
+    return [point['value'] for point in price_data]
+
 def get_price_data(token):
     """Fetch price data from Redstone Oracle"""
     try:
         # Get the correct symbol for the token
         symbol = TOKEN_SYMBOL_MAP.get(token, token)  # Default to token name if not in map
-        url = f"{REDSTONE_API_URL}?symbol={symbol}"
         
-        logger.info(f"Fetching price data for {token} (symbol: {symbol}) from Redstone Oracle")
+        logger.debug("Fetching price data for %s (symbol: %s) from Redstone Oracle", token, symbol)
         
-        # Get past price points
-        price_points = []
+        if PRICE_BATCH_FETCH:
+            url = f"{REDSTONE_API_URL}?symbol={symbol}&provider={REDSTONE_PROVIDER}&limit={PRICE_HISTORY_COUNT}"
+            fetch = _fetch_price_history(url)
+        else:
+            # Samples are scheduled PRICE_INTERVAL apart (the min/max window needs prices
+            # spread over time) but issued concurrently over one keep-alive connection,
+            # so request latency no longer adds up across samples
+            url = f"{REDSTONE_API_URL}?symbol={symbol}"
+            fetch = _fetch_price_points(url)
+        future = asyncio.run_coroutine_threadsafe(fetch, _get_price_loop())
+        price_points = future.result()
         
-        for i in range(PRICE_HISTORY_COUNT):
-            response = requests.get(url)
-            response.raise_for_status()
-            price_data = response.json()
-            
-            if not price_data or len(price_data) == 0:
-                logger.error(f"No price data returned for {token}")
-                return None
-                
-            price = price_data[0]['value']
-            price_points.append(price)
-            
-            logger.debug(f"Price point {i+1}/{PRICE_HISTORY_COUNT} for {token}: {price}")
-            
-            # Sleep between requests, except for the last one
-            if i < PRICE_HISTORY_COUNT - 1:
-                time.sleep(PRICE_INTERVAL)
+        if not price_points or any(price is None for price in price_points):
+            logger.error("No price data returned for %s", token)
+            return None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, price in enumerate(price_points):
+                logger.debug("Price point %d/%d for %s: %s", i+1, len(price_points), token, price)
         
-        # Calculate statistics
-        avg_price = statistics.mean(price_points)
+        # Calculate statistics (fsum/min/max run in C; fsum is exactly rounded, unlike
+        # sum, and still far faster than statistics.mean's fraction arithmetic)
+        avg_price = math.fsum(price_points) / len(price_points)
         min_price = min(price_points)
         max_price = max(price_points)
         current_price = price_points[-1]
         
-        logger.info(f"Price data for {token}: current={current_price}, avg={avg_price:.2f}, min={min_price}, max={max_price}")
+        logger.info("Price data for %s: current=%s, avg=%.2f, min=%s, max=%s", token, current_price, avg_price, min_price, max_price)
         
         # Calculate a normalized value in the range 0-255 based on where the current price 
         # falls within the recent min-max range
-        if max_price == min_price:  # Avoid division by zero
-            normalized_value = 128  # Middle of the range
+        price_range = max_price - min_price
+        if price_range == 0:
+            normalized_value = None  # Flat window carries no signal, strategies skip this tick
         else:
             # Scale to 0-255 range
-            normalized_value = int(((current_price - min_price) / (max_price - min_price)) * 255)
+            normalized_value = min(255, max(0, int((current_price - min_price) * 255 / price_range)))
         
-        logger.info(f"Normalized value for {token}: {normalized_value} (0-255 scale)")
+        logger.debug("Normalized value for %s: %s (0-255 scale)", token, normalized_value)
         
         return {
             "price_points": price_points,
@@ -95,20 +183,79 @@ def get_price_data(token):
             "normalized_value": normalized_value
         }
     except Exception as e:
-        logger.error(f"Error fetching price data for {token}: {e}")
+        logger.error("Error fetching price data for %s: %s", token, e)
         return None
 
+# Per-token price cache so strategies sharing a token (and adjacent ticks) reuse one fetch
+_price_cache = TTLCache(maxsize=64, ttl=PRICE_INTERVAL * PRICE_HISTORY_COUNT)
+_price_cache_lock = threading.Lock()
+_price_inflight = {}  # token -> Event set once the in-flight fetch completes
+
+def get_cached_price_data(token):
+    """Get price data for a token from the cache, fetching it at most once at a time"""
+    with _price_cache_lock:
+        if token in _price_cache:
+            return _price_cache[token]
+        event = _price_inflight.get(token)
+        is_owner = event is None
+        if is_owner:
+            event = _price_inflight[token] = threading.Event()
+    
+    if not is_owner:
+        # Another thread is already fetching this token, wait for its result
+        event.wait()
+        with _price_cache_lock:
+            return _price_cache.get(token)
+    
+    try:
+        price_data = get_price_data(token)
+        if price_data:
+            with _price_cache_lock:
+                _price_cache[token] = price_data
+        return price_data
+    finally:
+        with _price_cache_lock:
+            del _price_inflight[token]
+        event.set()
+
+def prefetch_price_data(tokens):
+    """Fetch price data for all tokens concurrently, returning a dict keyed by token"""
+    tokens = list(tokens)
+    if not tokens:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(tokens)) as executor:
+        return dict(zip(tokens, executor.map(get_cached_price_data, tokens)))
+
 # Fallback test value for strategy checking if Redstone fails
 TEST_VALUE = 40
 
+# Non-cryptographic PRNG for the fallback test values
+_rng = random.Random()
+_RAND = _rng.getrandbits
+
+def random_test_value():
+    """Random fallback test value between 20 and 80 (one 8-bit draw scaled into range)"""
+    return (_RAND(8) * 61 >> 8) + 20
+
+# Maximum number of concurrent strategy checks sent to the FHE server
+CHECK_WORKERS = 8
+
+# Matches the FHE server's "Result: true" check response
+_TRUE_RE = re.compile(rb"true", re.IGNORECASE)
+
+# Recent (strategy_id, side, value) checks on real price data that did not trigger. Strategy
+# bounds don't change once created, so repeating such a check would give the same answer;
+# the TTL bounds staleness if the FHE server is restarted and ids are reused.
+_negative_checks = TTLCache(maxsize=1024, ttl=300)
+
 def get_all_strategies():
     """Fetch all strategies from the FHE server"""
     try:
-        response = requests.get(f"{FHE_SERVER_URL}/get_all_strategies")
+        response = fhe_session.get(f"{FHE_SERVER_URL}/get_all_strategies")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
-        logger.error(f"Error fetching strategies: {e}")
+        logger.error("Error fetching strategies: %s", e)
         return []
 
 def check_strategy(strategy_id, strategy_type, value=TEST_VALUE):
@@ -119,17 +266,53 @@ def check_strategy(strategy_id, strategy_type, value=TEST_VALUE):
             "strategy_id": strategy_id,
             "value": value
         }
-        logger.info(f"Checking {strategy_type} strategy {strategy_id} with value: {value}")
-        response = requests.post(f"{FHE_SERVER_URL}{endpoint}", json=payload)
+        logger.debug("Checking %s strategy %s with value: %s", strategy_type, strategy_id, value)
+        response = fhe_session.post(f"{FHE_SERVER_URL}{endpoint}", json=payload)
         response.raise_for_status()
-        result = response.text
-        logger.info(f"Strategy check result: {result}")
+        result = response.content
+        logger.debug("Strategy check result: %s", result)
         
-        # Check if the result contains 'true' (case-insensitive)
-        return "true" in result.lower()
+        # Check if the result contains 'true' (case-insensitive) without decoding the body
+        return _TRUE_RE.search(result) is not None
     except Exception as e:
-        logger.error(f"Error checking {strategy_type} strategy {strategy_id}: {e}")
-        return False
+        logger.error("Error checking %s strategy %s: %s", strategy_type, strategy_id, e)
+        return None  # Distinguishes a failed check from a negative result
+
+# Cleared when the FHE server doesn't expose /check_batch so later ticks skip straight
+# to the per-check endpoints
+_batch_supported = True
+
+def check_strategies_batch(checks):
+    """Run (strategy_id, side, value) checks in one /check_batch request.
+
+    Returns a list of results aligned with checks (None for unknown strategies),
+    or None if the batch request itself failed.
+    """
+    global _batch_supported
+    payload = {"checks": [
+        {"strategy_id": strategy_id, "side": side, "value": value}
+        for strategy_id, side, value in checks
+    ]}
+    try:
+        response = fhe_session.post(f"{FHE_SERVER_URL}/check_batch", data=orjson.dumps(payload),
+                                    headers={"Content-Type": "application/json"})
+        if response.status_code == 404:
+            logger.info("FHE server has no /check_batch endpoint, using per-check requests")
+            _batch_supported = False
+            return None
+        response.raise_for_status()
+        results = orjson.loads(response.content)["results"]
+        if len(results) != len(checks):
+            raise ValueError(f"expected {len(checks)} results, got {len(results)}")
+        return [result.get("triggered") for result in results]
+    except Exception as e:
+        logger.error("Error running batch strategy check: %s", e)
+        return None
+
+def _check_strategies_concurrently(checks):
+    """Fallback for check_strategies_batch: one request per check on a capped pool"""
+    with ThreadPoolExecutor(max_workers=min(CHECK_WORKERS, len(checks))) as executor:
+        return list(executor.map(lambda check: check_strategy(*check), checks))
 
 def execute_trade(exchange, strategy, is_long):
     """Execute a trade based on the strategy"""
@@ -143,12 +326,12 @@ def execute_trade(exchange, strategy, is_long):
         # Determine if it's a buy or sell based on strategy type
         is_buy = is_long
         
-        logger.info(f"Executing {'long' if is_long else 'short'} trade for strategy {strategy_id} on {asset}, size: {size}")
+        logger.info("Executing %s trade for strategy %s on %s, size: %s", 'long' if is_long else 'short', strategy_id, asset, size)
         
         # Set up builder fee to go to the strategy creator
         builder_config = None
         if owner_address:
-            logger.info(f"Setting builder fee to go to strategy creator: {owner_address}")
+            logger.info("Setting builder fee to go to strategy creator: %s", owner_address)
             builder_config = {"b": owner_address, "f": 1}  # f=1 is 0.001% fee
         
         # Execute the market order with builder fee going to strategy creator
@@ -157,120 +340,114 @@ def execute_trade(exchange, strategy, is_long):
             builder=builder_config
         )
         
-        logger.info(f"Trade executed for strategy {strategy_id}. Result: {order_result}")
+        logger.info("Trade executed for strategy %s. Result: %s", strategy_id, order_result)
         
         # Update the strategy status in the FHE server
         try:
-            logger.info(f"Updating strategy {strategy_id} status to open (is_long={is_long})")
+            logger.info("Updating strategy %s status to open (is_long=%s)", strategy_id, is_long)
             payload = {
                 "strategy_id": strategy_id,
                 "is_long": is_long
             }
-            response = requests.post(f"{FHE_SERVER_URL}/open_trade", json=payload)
+            response = fhe_session.post(f"{FHE_SERVER_URL}/open_trade", json=payload)
             response.raise_for_status()
-            logger.info(f"Strategy {strategy_id} status updated successfully")
+            logger.info("Strategy %s status updated successfully", strategy_id)
         except Exception as update_error:
-            logger.error(f"Error updating strategy status: {update_error}")
+            logger.error("Error updating strategy status: %s", update_error)
         
         return order_result
     except Exception as e:
-        logger.error(f"Error executing trade for strategy: {e}")
+        logger.error("Error executing trade for strategy: %s", e)
         return None
 
-def check_and_execute_strategies():
+def check_and_execute_strategies(exchange):
     """Check all strategies and execute trades if conditions are met"""
     logger.info("Starting strategy check and execution")
     
     # Get all strategies
     strategies = get_all_strategies()
-    logger.info(f"Found {len(strategies)} strategies")
+    logger.info("Found %d strategies", len(strategies))
     
-    # Log all strategies for debugging
-    for i, strategy in enumerate(strategies):
-        logger.info(f"Strategy {i+1}: {json.dumps(strategy)}")
+    # Log all strategies for debugging (serializing them is skipped unless DEBUG is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, strategy in enumerate(strategies):
+            logger.debug("Strategy %d: %s", i+1, orjson.dumps(strategy).decode())
     
-    # Setup exchange connection
-    try:
-        address, info, exchange = example_utils.setup(constants.TESTNET_API_URL, skip_ws=True)
-        logger.info(f"Connected to exchange with account: {address}")
-    except Exception as e:
-        logger.error(f"Failed to setup exchange connection: {e}")
-        return
+    # Only strategies with investors and no open position need checking (open ones
+    # are already in a trade)
+    actionable = [
+        (i, strategy) for i, strategy in enumerate(strategies)
+        if strategy.get("investors") and not strategy.get("is_open", False)
+    ]
+    logger.info("Actionable strategies: %d/%d", len(actionable), len(strategies))
+    
+    # Fetch prices once per unique token instead of once per strategy
+    unique_tokens = {strategy.get("token", "ETH") for _, strategy in actionable}
+    price_data_by_token = prefetch_price_data(unique_tokens)
     
-    # Iterate over strategies
-    for i, strategy in enumerate(strategies):
+    # Collect the long/short checks for every strategy before issuing them
+    checks = []  # (strategy, strategy_id, side, value, price_data)
+    for i, strategy in actionable:
         # Use index+1 as a fallback ID if none exists
         strategy_id = strategy.get("id", i+1)
-        strategy_name = strategy.get("name", f"Strategy {strategy_id}")
-        investors = strategy.get("investors", [])
-        is_open = strategy.get("is_open", False)
         token = strategy.get("token", "ETH")
         
-        logger.info(f"Evaluating strategy {strategy_id} ({strategy_name}): token={token}, investors={len(investors)}, is_open={is_open}")
+        # Real price data from Redstone Oracle for the token (prefetched above)
+        price_data = price_data_by_token.get(token)
         
-        # Check if strategy has investors
-        if len(investors) > 0:
-            # If the strategy is already open, we don't need to check it again
-            if is_open:
-                logger.info(f"Strategy {strategy_id} is already open, skipping checks")
+        if price_data:
+            # Use normalized value from real price data for both long and short checks
+            test_value = price_data["normalized_value"]
+            if test_value is None:
+                logger.debug("Price window for %s is flat, skipping strategy %s this tick", token, strategy_id)
                 continue
-                
-            logger.info(f"Processing strategy {strategy_id} with {len(investors)} investors")
-            
-            # Get real price data from Redstone Oracle for the token
-            price_data = get_price_data(token)
+            logger.debug("Using real price data for %s: normalized value = %s", token, test_value)
+            checks.append((strategy, strategy_id, "long", test_value, price_data))
+            checks.append((strategy, strategy_id, "short", test_value, price_data))
+        else:
+            # Fallback to random values if Redstone API fails
+            logger.warning("Using fallback random values for %s due to Redstone API failure", token)
             
+            # Generate random test values for the long and short checks (between 20 and 80)
+            long_test_value = random_test_value()
+            short_test_value = random_test_value()
+            logger.debug("Using random test values for strategy checks: long=%s, short=%s", long_test_value, short_test_value)
+            checks.append((strategy, strategy_id, "long", long_test_value, None))
+            checks.append((strategy, strategy_id, "short", short_test_value, None))
+    
+    # Skip checks already known not to trigger for the same value
+    checks = [check for check in checks if (check[1], check[2], check[3]) not in _negative_checks]
+    if not checks:
+        return
+    
+    # Issue every check in a single batch request, falling back to concurrent per-check
+    # requests. Results are handled on this thread, so trade execution stays serialized.
+    check_args = [(strategy_id, side, value) for _, strategy_id, side, value, _ in checks]
+    results = check_strategies_batch(check_args) if _batch_supported else None
+    if results is None:
+        results = _check_strategies_concurrently(check_args)
+    
+    triggered = []
+    for (strategy, strategy_id, side, value, price_data), result in zip(checks, results):
+        source = "value" if price_data else "random value"
+        if result:
+            triggered.append(f"{side} {strategy_id}")
             if price_data:
-                # Use normalized value from real price data
-                test_value = price_data["normalized_value"]
-                logger.info(f"Using real price data for {token}: normalized value = {test_value}")
-                
-                # Check long strategy with real price data
-                long_result = check_strategy(strategy_id, "long", test_value)
-                if long_result:
-                    logger.info(f"Long strategy {strategy_id} triggered with value {test_value}!")
-                    logger.info(f"Price data: current={price_data['current_price']}, avg={price_data['avg_price']:.2f}")
-                    execute_trade(exchange, strategy, True)
-                else:
-                    logger.info(f"Long strategy {strategy_id} not triggered with value {test_value}")
-                
-                # Check short strategy with the same real price data
-                short_result = check_strategy(strategy_id, "short", test_value)
-                if short_result:
-                    logger.info(f"Short strategy {strategy_id} triggered with value {test_value}!")
-                    logger.info(f"Price data: current={price_data['current_price']}, avg={price_data['avg_price']:.2f}")
-                    execute_trade(exchange, strategy, False)
-                else:
-                    logger.info(f"Short strategy {strategy_id} not triggered with value {test_value}")
+                logger.info("%s strategy %s triggered with %s %s (current=%s, avg=%.2f)",
+                            side.capitalize(), strategy_id, source, value,
+                            price_data['current_price'], price_data['avg_price'])
             else:
-                # Fallback to random values if Redstone API fails
-                logger.warning(f"Using fallback random values for {token} due to Redstone API failure")
-                
-                # Generate a random test value for long strategy check (between 20 and 80)
-                long_test_value = random.randint(20, 80)
-                logger.info(f"Using random test value for long strategy check: {long_test_value}")
-                
-                # Check long strategy with random test value
-                long_result = check_strategy(strategy_id, "long", long_test_value)
-                if long_result:
-                    logger.info(f"Long strategy {strategy_id} triggered with random value!")
-                    execute_trade(exchange, strategy, True)
-                else:
-                    logger.info(f"Long strategy {strategy_id} not triggered with random value")
-                
-                # Generate a random test value for short strategy check (between 20 and 80)
-                short_test_value = random.randint(20, 80)
-                logger.info(f"Using random test value for short strategy check: {short_test_value}")
-                
-                # Check short strategy with random test value
-                short_result = check_strategy(strategy_id, "short", short_test_value)
-                if short_result:
-                    logger.info(f"Short strategy {strategy_id} triggered with random value!")
-                    execute_trade(exchange, strategy, False)
-                else:
-                    logger.info(f"Short strategy {strategy_id} not triggered with random value")
+                logger.info("%s strategy %s triggered with %s %s", side.capitalize(), strategy_id, source, value)
+            execute_trade(exchange, strategy, side == "long")
         else:
-            logger.info(f"Skipping strategy {strategy_id}: has_investors={len(investors)>0}, is_open={is_open}")
+            logger.debug("%s strategy %s not triggered with %s %s", side.capitalize(), strategy_id, source, value)
+            if result is False and price_data:
+                # Only real price-derived values: a random fallback value mustn't suppress a later real check
+                _negative_checks[(strategy_id, side, value)] = True
+    
+    # One summary line per tick instead of a line per check
+    logger.info("Checked %d strategy conditions: %d triggered%s",
+                len(checks), len(triggered), f" ({', '.join(triggered)})" if triggered else "")
 
 # Time between checks in seconds
 CHECK_INTERVAL = 5
@@ -284,39 +461,48 @@ def main():
         raise Exception("Only the main wallet has permission to approve a builder fee")
 
     # Log the connected account
-    logger.info(f"Connected to exchange with account: {address}")
+    logger.info("Connected to exchange with account: %s", address)
     
     # Approve setting a builder fee - this is required before any trades can use builder fees
     approve_result = exchange.approve_builder_fee("0xcE716032dFe9d5BB840568171F541A6A046bBf90", "0.001%")
-    logger.info(f"Builder fee approval result: {approve_result}")
+    logger.info("Builder fee approval result: %s", approve_result)
     
     # Test the Redstone Oracle integration
     logger.info("Testing Redstone Oracle integration...")
     for token in ["ETH", "BTC", "SOL"]:
         price_data = get_price_data(token)
         if price_data:
-            logger.info(f"✅ Successfully fetched {token} price data from Redstone Oracle")
-            logger.info(f"   Current price: ${price_data['current_price']:.2f}")
-            logger.info(f"   Normalized value (0-255): {price_data['normalized_value']}")
-            logger.info(f"   Price points: {price_data['price_points']}")
+            logger.info("✅ Successfully fetched %s price data from Redstone Oracle", token)
+            logger.info("   Current price: $%.2f", price_data['current_price'])
+            logger.info("   Normalized value (0-255): %s", price_data['normalized_value'])
+            logger.info("   Price points: %s", price_data['price_points'])
         else:
-            logger.error(f"❌ Failed to fetch {token} price data from Redstone Oracle")
+            logger.error("❌ Failed to fetch %s price data from Redstone Oracle", token)
     
     # Each trade will set the builder fee to go to the strategy creator
 
     # Run strategy checking in a continuous loop
-    logger.info(f"Starting continuous monitoring every {CHECK_INTERVAL} seconds")
+    logger.info("Starting continuous monitoring every %s seconds", CHECK_INTERVAL)
     try:
+        # Ticks are scheduled on a fixed monotonic grid so the work time of a tick
+        # doesn't stretch the interval; an overrunning tick restarts the grid
+        next_deadline = time.monotonic()
         while True:
             logger.info("------- Checking strategies -------")
-            check_and_execute_strategies()
-            logger.info(f"Sleeping for {CHECK_INTERVAL} seconds...")
-            time.sleep(CHECK_INTERVAL)
+            check_and_execute_strategies(exchange)
+            next_deadline += CHECK_INTERVAL
+            delay = next_deadline - time.monotonic()
+            if delay < 0:
+                logger.warning("Tick overran the %s second interval by %.2fs", CHECK_INTERVAL, -delay)
+                next_deadline = time.monotonic()
+            else:
+                logger.debug("Sleeping for %.2f seconds...", delay)
+                time.sleep(delay)
     except KeyboardInterrupt:
         logger.info("Monitoring stopped by user")
         return
     except Exception as e:
-        logger.error(f"Error in monitoring loop: {e}")
+        logger.error("Error in monitoring loop: %s", e)
         return
 
 if __name__ == "__main__":
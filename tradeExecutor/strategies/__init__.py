@@ -1,20 +1,46 @@
 """
 Trading Strategy Templates
 Collection of different trading strategy implementations using real market data
+
+Strategy classes and helpers are imported lazily on first access (PEP 562), so importing the
+package doesn't pay for the numeric dependencies of every strategy module.
+
+analyze_many(strategies, price_data, current_price) runs several strategies over one price
+series and returns their TradingSignals as a list, in the order of strategies (one entry per
+strategy, so strategies sharing a name are all kept).
 """
 
-from .rsi_strategy import RSIStrategy
-from .macd_strategy import MACDStrategy  
-from .bollinger_strategy import BollingerBandsStrategy
-from .sma_strategy import SMAStrategy
-from .ema_strategy import EMAStrategy
-from .atr_strategy import ATRStrategy
+import importlib
+
+_LAZY = {
+    'RSIStrategy': '.rsi_strategy',
+    'MACDStrategy': '.macd_strategy',
+    'BollingerBandsStrategy': '.bollinger_strategy',
+    'SMAStrategy': '.sma_strategy',
+    'EMAStrategy': '.ema_strategy',
+    'ATRStrategy': '.atr_strategy',
+    'PriceBuffer': '.base_strategy',
+    'analyze_many': '.base_strategy'
+}
 
 __all__ = [
     'RSIStrategy',
     'MACDStrategy',
-    'BollingerBandsStrategy', 
+    'BollingerBandsStrategy',
     'SMAStrategy',
     'EMAStrategy',
-    'ATRStrategy'
-]
\ No newline at end of file
+    'ATRStrategy',
+    'PriceBuffer',
+    'analyze_many'
+]
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    attr = getattr(module, name)
+    globals()[name] = attr  # Cache so later lookups skip __getattr__
+    return attr
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,16 @@
+"""
+Optional numba JIT for the strategy kernels
+Falls back to a no-op decorator (plain Python) when numba isn't installed
+"""
+
+try:
+    from numba import njit
+    JIT_ENABLED = True
+except ImportError:
+    JIT_ENABLED = False  # Callers may prefer a vectorized NumPy/SciPy path over the Python loop
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
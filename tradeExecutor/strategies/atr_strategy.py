@@ -3,62 +3,195 @@ ATR (Average True Range) Trading Strategy
 Volatility-based strategy using ATR for position sizing and stop-loss management
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
+from types import MappingProxyType
+import math
+import numpy as np
+from scipy.signal import lfilter
+from ._njit import njit, JIT_ENABLED
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Explicit signature: compiled eagerly at import (and cached on disk) instead of on the
+# first call. Callers pass a contiguous float64 array (as_array guarantees this).
+@njit("float64(float64[::1], int64)", cache=True)
+def _atr_loop(prices, period):
+    """Wilder-smoothed ATR over close prices (true range = absolute move between closes)"""
+    atr = 0.0
+    for i in range(1, period + 1):
+        atr += abs(prices[i] - prices[i - 1])
+    atr /= period
+    for i in range(period + 1, len(prices)):
+        atr += (abs(prices[i] - prices[i - 1]) - atr) / period
+    return atr
+
+@njit("UniTuple(float64, 4)(float64[::1], int64, float64, float64, float64)", cache=True)
+def _atr_levels(prices, sr_window, atr, atr_distance, current_price):
+    """
+    (support, resistance, price_change %, volatility %) in one pass over the tail
+    
+    Support/resistance are the lowest trough and highest peak over the last sr_window
+    prices, falling back to the last price -/+ atr_distance; momentum is measured from
+    the start of the last 5 periods.
+    """
+    n = len(prices)
+    last_price = prices[n - 1]
+    support = np.inf
+    resistance = -np.inf
+    for i in range(max(n - sr_window, 0) + 1, n - 1):
+        rise = prices[i] - prices[i - 1]
+        fall = prices[i + 1] - prices[i]
+        if rise > 0 and fall < 0:
+            resistance = max(resistance, prices[i])
+        elif rise < 0 and fall > 0:
+            support = min(support, prices[i])
+    if resistance == -np.inf:
+        resistance = last_price + atr_distance
+    if support == np.inf:
+        support = last_price - atr_distance
+    
+    momentum_base = prices[max(n - 5, 0)]
+    price_change = (current_price - momentum_base) / momentum_base * 100 if momentum_base > 0 else 0.0
+    volatility_percentage = atr / current_price * 100 if current_price > 0 else 0.0
+    return max(support, 0.0), resistance, price_change, volatility_percentage
+
+def _find_peaks_troughs(arr):
+    """Boolean masks of local peaks and troughs along the last axis (sign changes of np.diff)"""
+    slope = np.sign(np.diff(arr, axis=-1))
+    peaks = np.zeros(arr.shape, dtype=bool)
+    troughs = np.zeros(arr.shape, dtype=bool)
+    peaks[..., 1:-1] = (slope[..., :-1] > 0) & (slope[..., 1:] < 0)
+    troughs[..., 1:-1] = (slope[..., :-1] < 0) & (slope[..., 1:] > 0)
+    return peaks, troughs
+
+def _atr_levels_vectorized(prices, sr_window, atr, atr_distance, current_price):
+    """NumPy version of _atr_levels, used instead of the plain Python loop without numba"""
+    window = prices[max(len(prices) - sr_window, 0):]
+    peaks, troughs = _find_peaks_troughs(window)
+    resistance = float(window[peaks].max()) if peaks.any() else float(prices[-1]) + atr_distance
+    support = float(window[troughs].min()) if troughs.any() else float(prices[-1]) - atr_distance
+    
+    momentum_base = float(prices[max(len(prices) - 5, 0)])
+    price_change = (current_price - momentum_base) / momentum_base * 100 if momentum_base > 0 else 0.0
+    volatility_percentage = atr / current_price * 100 if current_price > 0 else 0.0
+    return max(support, 0.0), resistance, price_change, volatility_percentage
+
+_tail_levels = _atr_levels if JIT_ENABLED else _atr_levels_vectorized
+
+# Signal and reason template for each ATR decision branch (see ATRStrategy._decide)
+_ATR_BRANCH_SIGNALS = ("HOLD", "BUY", "SELL", "BUY", "SELL", "BUY", "SELL")
+_ATR_BRANCH_REASONS = (
+    "Neutral market conditions",
+    "Strong upward momentum: {:.1f}% vs ATR breakout: {:.1f}%",
+    "Strong downward momentum: {:.1f}% vs ATR breakout: {:.1f}%",
+    "High volatility continuation: ATR={:.1f}%",
+    "High volatility continuation: ATR={:.1f}%",
+    "Price testing support at {:.2f} with slight upward bias",
+    "Price testing resistance at {:.2f} with slight downward bias",
+)
+
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'period': 14,           # ATR calculation period
+    'atr_multiplier': 2.0,  # Multiplier for stop-loss calculations  
+    'risk_percentage': 0.02, # Maximum risk per trade (2%)
+    'breakout_threshold': 1.5, # ATR multiplier for breakout signals
+    'trend_filter': True,   # Use ATR to confirm trends
+    'sr_window': 20,        # Lookback for peak/trough support and resistance
+    'volatility_estimator': 'atr',  # 'atr' or 'ewma' (EWMA of returns, scaled to price)
+    'alpha': 0.06           # EWMA weight of the latest squared return
+})
+
 class ATRStrategy(BaseStrategy):
     """ATR-based volatility and risk management strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'period': 14,           # ATR calculation period
-            'atr_multiplier': 2.0,  # Multiplier for stop-loss calculations  
-            'risk_percentage': 0.02, # Maximum risk per trade (2%)
-            'breakout_threshold': 1.5, # ATR multiplier for breakout signals
-            'trend_filter': True    # Use ATR to confirm trends
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
+    
+    # Wilder-smoothed ATR carried between analyze() calls
+    _atr_state: Optional[float] = None
+    _atr_period: Optional[int] = None
+    
+    # EWMA variance of returns carried between analyze() calls
+    _ewma_var: Optional[float] = None
     
     def get_signal_type(self) -> str:
         return "volatility"
     
     def calculate_atr(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Average True Range"""
+        """Calculate Average True Range (Wilder's smoothing, seeded with the SMA of the first period)"""
         if len(prices) < period + 1:
             return 0.0
         
-        true_ranges = []
-        
-        for i in range(1, len(prices)):
-            current_high = max(prices[i], prices[i-1])
-            current_low = min(prices[i], prices[i-1])
-            
-            # True range calculation
-            true_range = current_high - current_low
-            true_ranges.append(abs(true_range))
+        arr = self.as_array(prices)
+        if JIT_ENABLED:
+            return float(_atr_loop(arr, period))
         
-        # Calculate ATR as average of true ranges
-        if len(true_ranges) >= period:
-            recent_ranges = true_ranges[-period:]
-            atr = sum(recent_ranges) / len(recent_ranges)
-            return atr
+        true_ranges = np.abs(np.diff(arr))
+        atr = float(true_ranges[:period].mean())
         
-        return 0.0
+        # Wilder smoothing atr = (atr * (period - 1) + tr) / period as one IIR filter pass
+        if len(true_ranges) > period:
+            decay = (period - 1) / period
+            atr = float(lfilter([1 / period], [1.0, -decay], true_ranges[period:], zi=[atr * decay])[0][-1])
+        return atr
+    
+    def update_atr(self, prices: List[float], period: int = 14) -> float:
+        """ATR for prices, updated in O(1) when prices adds one point to the previous call's data"""
+        prices = self.as_array(prices)
+        step = self._series_step('atr', prices)
+        if (self._atr_state is None or self._atr_period != period or step is None
+                or (step == 1 and len(prices) <= period + 1)):
+            self._atr_state = self.calculate_atr(prices, period)
+            self._atr_period = period
+        elif step == 1:
+            self._atr_state += (abs(float(prices[-1] - prices[-2])) - self._atr_state) / period
+        return self._atr_state
+    
+    def calculate_ewma_vol(self, last_return: float) -> float:
+        """Fold one return into the EWMA variance: var_n = alpha * r_{n-1}^2 + (1 - alpha) * var_{n-1}"""
+        alpha = self.params['alpha']
+        self._ewma_var += alpha * (last_return * last_return - self._ewma_var)  # LERP form, equal up to rounding
+        return math.sqrt(self._ewma_var)
+    
+    def update_ewma_vol(self, prices: List[float]) -> float:
+        """EWMA return volatility for prices, O(1) when prices adds one point to the previous call's data"""
+        period = self.params['period']
+        prices = self.as_array(prices)
+        step = self._series_step('ewma', prices)
+        if self._ewma_var is not None and step == 0:
+            return math.sqrt(self._ewma_var)
+        if self._ewma_var is not None and step == 1:
+            return self.calculate_ewma_vol(float(prices[-1] / prices[-2] - 1))
+        if len(prices) <= period + 1:
+            self._ewma_var = None
+            return 0.0
+        # Seed with the sample variance of the first period's returns, then fold in the rest
+        returns = prices[1:] / prices[:-1] - 1
+        self._ewma_var = float(returns[:period].var(ddof=1))
+        vol = math.sqrt(self._ewma_var)
+        for last_return in returns[period:].tolist():
+            vol = self.calculate_ewma_vol(last_return)
+        return vol
     
     def calculate_support_resistance(self, prices: List[float], current_atr: float) -> Dict[str, float]:
-        """Calculate support and resistance levels using ATR"""
-        if not prices or current_atr <= 0:
-            return {'support': 0.0, 'resistance': 0.0}
+        """
+        Calculate support and resistance levels
         
-        current_price = prices[-1]
+        Resistance is the highest peak and support the lowest trough over the last
+        sr_window prices. Without a peak (trough) in the window, the level falls back
+        to the current price plus (minus) the ATR distance.
+        """
+        if len(prices) == 0 or current_atr <= 0:
+            return {'support': 0.0, 'resistance': 0.0}
         
-        # Use ATR to create dynamic support/resistance levels
+        current_price = float(prices[-1])
         atr_distance = current_atr * self.params['atr_multiplier']
-        
-        support = current_price - atr_distance
-        resistance = current_price + atr_distance
+        support, resistance, _, _ = _tail_levels(
+            self.as_array(prices), self.params['sr_window'], current_atr, atr_distance, current_price
+        )
         
         return {
-            'support': max(support, 0.0),
+            'support': support,
             'resistance': resistance,
             'atr_distance': atr_distance,
             'atr_percentage': (atr_distance / current_price) * 100 if current_price > 0 else 0.0
@@ -67,7 +200,13 @@ class ATRStrategy(BaseStrategy):
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using ATR strategy"""
-        if not self.validate_data(price_data, min_periods=self.params['period'] + 2):
+        # Work on the float64 array from here on; slices below are views
+        prices = self.as_array(price_data)
+        cached = self._cached_hold(prices, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
+        if not self.validate_data(prices, min_periods=self.params['period'] + 2):
             return TradingSignal(
                 signal_type="HOLD",
                 confidence=0.0,
@@ -75,7 +214,11 @@ class ATRStrategy(BaseStrategy):
             )
         
         # Calculate ATR and related metrics
-        atr = self.calculate_atr(price_data, self.params['period'])
+        if self.params['volatility_estimator'] == 'ewma':
+            # Express return volatility in price units so it stands in for ATR
+            atr = self.update_ewma_vol(prices) * prices[-1]
+        else:
+            atr = self.update_atr(prices, self.params['period'])
         if atr <= 0:
             return TradingSignal(
                 signal_type="HOLD",
@@ -83,78 +226,147 @@ class ATRStrategy(BaseStrategy):
                 reason="Cannot calculate valid ATR from data"
             )
         
-        # Calculate support/resistance levels
-        levels = self.calculate_support_resistance(price_data, atr)
-        
-        # Use recent price movement for momentum
-        recent_prices = price_data[-5:]  # Last 5 periods for momentum
-        price_change = ((current_price - recent_prices[0]) / recent_prices[0]) * 100 if recent_prices[0] > 0 else 0.0
-        
-        # Calculate volatility-based indicators
-        volatility_percentage = (atr / current_price) * 100 if current_price > 0 else 0.0
-        
-        # Determine signal based on ATR and price action
-        signal_type = "HOLD"
-        confidence = 0.0
-        reason = "Neutral market conditions"
+        # Support/resistance levels, momentum and volatility from one pass over the tail
+        support, resistance, price_change, volatility_percentage = _tail_levels(
+            prices, self.params['sr_window'], atr, atr * self.params['atr_multiplier'], float(current_price)
+        )
         
-        # ATR breakout signals
-        breakout_distance = atr * self.params['breakout_threshold']
+        # Determine signal based on ATR and price action; _decide evaluates the branch
+        # conditions with np.select, the same code path as analyze_batch
+        with np.errstate(divide='ignore', invalid='ignore'):
+            branch, confidence = self._decide(
+                np.float64(price_change), np.float64(volatility_percentage), atr,
+                current_price, support, resistance
+            )
+        branch = int(branch)
+        signal_type = _ATR_BRANCH_SIGNALS[branch]
+        confidence = float(confidence)
+        # Reasons are formatted lazily, only if something reads them
+        reason = _ATR_BRANCH_REASONS[branch]
+        reason_args = self._reason_args(branch, price_change, atr * self.params['breakout_threshold'],
+                                        volatility_percentage, support, resistance)
         
-        # Strong upward movement (buy signal)
-        if price_change > breakout_distance:
-            signal_type = "BUY"
-            confidence = min(price_change / (volatility_percentage + 0.01), 1.0)
-            reason = f"Strong upward momentum: {price_change:.1f}% vs ATR breakout: {breakout_distance:.1f}%"
-        
-        # Strong downward movement (sell signal)
-        elif price_change < -breakout_distance:
-            signal_type = "SELL"
-            confidence = min(-price_change / (volatility_percentage + 0.01), 1.0)
-            reason = f"Strong downward momentum: {price_change:.1f}% vs ATR breakout: {breakout_distance:.1f}%"
-        
-        # ATR expansion/contraction signals
-        elif volatility_percentage > self.params['risk_percentage'] * 100:
-            # High volatility - potential for continuation
-            if price_change > 0:
-                signal_type = "BUY"
-                confidence = min(price_change / volatility_percentage, 0.7)
-                reason = f"High volatility continuation: ATR={volatility_percentage:.1f}%"
-            else:
-                signal_type = "SELL"
-                confidence = min(-price_change / volatility_percentage, 0.7)
-                reason = f"High volatility continuation: ATR={volatility_percentage:.1f}%"
-        
-        # Support/resistance testing
-        else:
-            # Price testing support/resistance levels
-            distance_to_support = abs(current_price - levels['support'])
-            distance_to_resistance = abs(current_price - levels['resistance'])
-            
-            if distance_to_support < atr and price_change > 0:
-                signal_type = "BUY"
-                confidence = min(abs(price_change) / volatility_percentage, 0.5)
-                reason = f"Price testing support at {levels['support']:.2f} with slight upward bias"
-                
-            elif distance_to_resistance < atr and price_change < 0:
-                signal_type = "SELL"
-                confidence = min(abs(price_change) / volatility_percentage, 0.5)
-                reason = f"Price testing resistance at {levels['resistance']:.2f} with slight downward bias"
-        
-        return TradingSignal(
+        signal = TradingSignal(
             signal_type=signal_type,
             confidence=confidence,
             reason=reason,
+            reason_args=reason_args,
             metadata={
                 'atr': atr,
                 'current_price': current_price,
                 'volatility_percentage': volatility_percentage,
                 'price_change_percent': price_change,
-                'support': levels['support'],
-                'resistance': levels['resistance'],
+                'support': support,
+                'resistance': resistance,
                 'risk_per_trade': self.params['risk_percentage']
             }
         )
+        return self._remember_hold(signal, prices, current_price)
+    
+    def _decide(self, price_change, volatility_percentage, atr, current_price, support, resistance):
+        """
+        Decision branch and confidence for arrays of ATR inputs
+        
+        Branches: 0 neutral, 1 strong up, 2 strong down, 3/4 high volatility up/down,
+        5 testing support, 6 testing resistance. np.select takes the first matching
+        condition, mirroring the if/elif order in analyze.
+        """
+        breakout_distance = atr * self.params['breakout_threshold']
+        high_volatility = volatility_percentage > self.params['risk_percentage'] * 100
+        conditions = [
+            price_change > breakout_distance,
+            price_change < -breakout_distance,
+            high_volatility & (price_change > 0),
+            high_volatility,
+            (np.abs(current_price - support) < atr) & (price_change > 0),
+            (np.abs(current_price - resistance) < atr) & (price_change < 0),
+        ]
+        branch = np.select(conditions, [1, 2, 3, 4, 5, 6], default=0)
+        move = np.abs(price_change)
+        confidence = np.select(conditions, [
+            np.minimum(move / (volatility_percentage + 0.01), 1.0),
+            np.minimum(move / (volatility_percentage + 0.01), 1.0),
+            np.minimum(move / volatility_percentage, 0.7),
+            np.minimum(-price_change / volatility_percentage, 0.7),
+            np.minimum(move / volatility_percentage, 0.5),
+            np.minimum(move / volatility_percentage, 0.5),
+        ], default=0.0)
+        return branch, confidence
+    
+    def _reason_args(self, branch: int, price_change: float, breakout_distance: float,
+                     volatility_percentage: float, support: float, resistance: float) -> tuple:
+        """Arguments for the reason template of an ATR decision branch"""
+        if branch in (1, 2):
+            return (price_change, breakout_distance)
+        if branch in (3, 4):
+            return (volatility_percentage,)
+        if branch == 5:
+            return (support,)
+        if branch == 6:
+            return (resistance,)
+        return ()
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix (stateless: full Wilder ATR per row)"""
+        if self.params['volatility_estimator'] == 'ewma':
+            return super().analyze_batch(price_matrix, current_prices)
+        
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        current = np.asarray(current_prices, dtype=np.float64)
+        period = self.params['period']
+        valid = self.validate_batch(prices, min_periods=period + 2)
+        if not valid.any():
+            return [TradingSignal(signal_type="HOLD", confidence=0.0, reason="Insufficient data for ATR calculation")
+                    for _ in range(len(prices))]
+        
+        # Wilder-smoothed ATR for every row at once
+        true_ranges = np.abs(np.diff(prices, axis=1))
+        atr = true_ranges[:, :period].mean(axis=1)
+        for column in true_ranges[:, period:].T:
+            atr += (column - atr) / period
+        
+        # Support/resistance, momentum and volatility, as in analyze
+        atr_distance = atr * self.params['atr_multiplier']
+        window = prices[:, -self.params['sr_window']:]
+        peaks, troughs = _find_peaks_troughs(window)
+        resistance = np.where(peaks.any(axis=1), np.where(peaks, window, -np.inf).max(axis=1),
+                              prices[:, -1] + atr_distance)
+        support = np.maximum(np.where(troughs.any(axis=1), np.where(troughs, window, np.inf).min(axis=1),
+                                      prices[:, -1] - atr_distance), 0.0)
+        momentum_base = prices[:, max(prices.shape[1] - 5, 0)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change = np.where(momentum_base > 0, (current - momentum_base) / momentum_base * 100, 0.0)
+            volatility_percentage = np.where(current > 0, atr / current * 100, 0.0)
+            branch, confidence = self._decide(price_change, volatility_percentage, atr, current, support, resistance)
+        breakout_distance = atr * self.params['breakout_threshold']
+        
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i] or atr[i] <= 0:
+                # The HOLD analyze returns, built directly: analyze would touch the incremental state
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for ATR calculation" if not valid[i] else "Cannot calculate valid ATR from data"
+                ))
+                continue
+            signals.append(TradingSignal(
+                signal_type=_ATR_BRANCH_SIGNALS[branch[i]],
+                confidence=float(confidence[i]),
+                reason=_ATR_BRANCH_REASONS[branch[i]],
+                reason_args=self._reason_args(branch[i], price_change[i], breakout_distance[i],
+                                              volatility_percentage[i], support[i], resistance[i]),
+                metadata={
+                    'atr': float(atr[i]),
+                    'current_price': float(current[i]),
+                    'volatility_percentage': float(volatility_percentage[i]),
+                    'price_change_percent': float(price_change[i]),
+                    'support': float(support[i]),
+                    'resistance': float(resistance[i]),
+                    'risk_per_trade': self.params['risk_percentage']
+                }
+            ))
+        return signals
     
     def calculate_position_size(self, atr: float, current_price: float, account_balance: float) -> float:
         """Calculate optimal position size based on ATR"""
@@ -179,7 +391,10 @@ class ATRStrategy(BaseStrategy):
             'atr_multiplier': self.params['atr_multiplier'],
             'risk_percentage': self.params['risk_percentage'] * 100,
             'breakout_threshold': self.params['breakout_threshold'],
-            'trend_filter_enabled': self.params['trend_filter']
+            'trend_filter_enabled': self.params['trend_filter'],
+            'sr_window': self.params['sr_window'],
+            'volatility_estimator': self.params['volatility_estimator'],
+            'alpha': self.params['alpha']
         }
     
     def explain_parameters(self) -> str:
@@ -191,6 +406,8 @@ class ATRStrategy(BaseStrategy):
         - Risk Percentage: {self.params['risk_percentage']*100}% per trade
         - Breakout Threshold: {self.params['breakout_threshold']} ATR levels
         - Trend Filter: {self.params['trend_filter']} (confirm signals with trend)
+        - Support/Resistance Window: {self.params['sr_window']} periods (lowest trough / highest peak)
+        - Volatility Estimator: {self.params['volatility_estimator']} (EWMA alpha: {self.params['alpha']})
         - Token: {self.token}
         
         Risk Management:
@@ -205,26 +422,26 @@ class ATRStrategy(BaseStrategy):
         """
 
 # Example ATR configurations
-ATR_CONFIGS = {
-    'conservative': {
+ATR_CONFIGS = MappingProxyType({
+    'conservative': MappingProxyType({
         'period': 21,
         'atr_multiplier': 1.5,
         'risk_percentage': 0.015,
         'breakout_threshold': 1.2,
         'trend_filter': True
-    },
-    'moderate': {
+    }),
+    'moderate': MappingProxyType({
         'period': 14,
         'atr_multiplier': 2.0,
         'risk_percentage': 0.02,
         'breakout_threshold': 1.5,
         'trend_filter': True
-    },
-    'aggressive': {
+    }),
+    'aggressive': MappingProxyType({
         'period': 10,
         'atr_multiplier': 2.5,
         'risk_percentage': 0.03,
         'breakout_threshold': 2.0,
         'trend_filter': False
-    }
-}
\ No newline at end of file
+    })
+})
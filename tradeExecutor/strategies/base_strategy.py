@@ -4,53 +4,151 @@ Implements common functionality and interfaces
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List, Any
+from collections import deque
+from typing import Dict, Optional, List, Any, Mapping, Union
 import logging
 from datetime import datetime
+import numpy as np
 
 logger = logging.getLogger("BaseStrategy")
 
+# Trailing prices kept in a BaseStrategy._series_step fingerprint
+_FINGERPRINT_TAIL = 8
+
+class PriceBuffer:
+    """Fixed-capacity price history with O(1) append
+    
+    Every price is written twice, at head and head + capacity, so the last
+    `capacity` prices are always one contiguous slice of the backing array:
+    view() and slicing return float64 views, never copies. A view stays valid
+    until the next append.
+    """
+    
+    __slots__ = ('data', 'head', 'size', 'capacity')
+    
+    def __init__(self, capacity: int, prices: Optional[List[float]] = None):
+        if capacity < 1:
+            raise ValueError(f"PriceBuffer capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.data = np.empty(2 * capacity, dtype=np.float64)
+        self.head = 0  # Next write position in [0, capacity)
+        self.size = 0
+        if prices is not None:
+            self.extend(prices)
+    
+    def append(self, price: float):
+        self.data[self.head] = self.data[self.head + self.capacity] = price
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def extend(self, prices: List[float]):
+        for price in prices[-self.capacity:]:
+            self.append(price)
+    
+    def view(self) -> np.ndarray:
+        """The buffered prices, oldest first, as a contiguous view"""
+        end = self.head + self.capacity
+        return self.data[end - self.size:end]
+    
+    def last(self, n: int) -> np.ndarray:
+        """The most recent n prices as a contiguous view"""
+        return self.view()[-n:] if n else self.data[:0]
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __getitem__(self, index):
+        return self.view()[index]
+    
+    def __iter__(self):
+        return iter(self.view())
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.view() if dtype is None else self.view().astype(dtype, copy=False)
+
+# Price series accepted by the strategies: a list of floats, a float64 array or a PriceBuffer
+PriceSeries = Union[List[float], np.ndarray, PriceBuffer]
+
 class TradingSignal:
-    """Represents a trading signal from a strategy"""
+    """Represents a trading signal from a strategy
+    
+    When reason_args is given, reason is a str.format template that is only
+    formatted the first time the reason is read.
+    """
+    
+    # No per-instance __dict__: signals are kept by the thousand in strategy histories
+    __slots__ = ('signal_type', 'confidence', '_reason', '_reason_args', 'timestamp', 'metadata')
     
     def __init__(self, signal_type: str, confidence: float, reason: str, 
-                 timestamp: datetime = None, metadata: Dict[str, Any] = None):
+                 timestamp: datetime = None, metadata: Dict[str, Any] = None,
+                 reason_args: Optional[tuple] = None):
         self.signal_type = signal_type.upper()  # BUY, SELL, HOLD
         self.confidence = confidence  # 0.0 to 1.0
-        self.reason = reason
+        self._reason = reason
+        self._reason_args = reason_args
         self.timestamp = timestamp or datetime.now()
         self.metadata = metadata or {}
+    
+    @property
+    def reason(self) -> str:
+        if self._reason_args is not None:
+            self._reason = self._reason.format(*self._reason_args)
+            self._reason_args = None
+        return self._reason
+    
+    @reason.setter
+    def reason(self, reason: str):
+        self._reason = reason
+        self._reason_args = None
         
     def __str__(self):
         return f"{self.signal_type} (confidence: {self.confidence:.2f}) - {self.reason}"
 
 class BaseStrategy(ABC):
-    """Abstract base class for all trading strategies"""
+    """Abstract base class for all trading strategies
+    
+    Price data is processed as a contiguous float64 array. Callers may pass a list,
+    which analyze converts once per call with as_array, or pass a float64 ndarray
+    or a PriceBuffer directly to skip the conversion.
+    """
+    
+    # Last HOLD from analyze and the current price it was computed for. While the series is
+    # the same or one bar longer than on the previous call (see _series_step) and the current
+    # price stays within hold_tolerance (relative) of that price, the HOLD is returned again
+    # without recomputing the indicators; 0.0 disables the shortcut.
+    hold_tolerance = 1e-4
+    _hold_price: Optional[float] = None
+    _hold_signal: Optional[TradingSignal] = None
     
     def __init__(self, name: str, token: str = "ETH", **kwargs):
         self.name = name
         self.token = token.upper()
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
         self.enabled = True
-        self.history = []  # Store signal history for analysis
+        self.history = deque(maxlen=1000)  # Last 1000 signals for analysis; older ones are evicted
+        self._last_series: Dict[str, tuple] = {}  # Per incremental state, see _series_step
         
-        # Strategy-specific parameters
-        self.params = self._get_default_params()
-        self.params.update(kwargs)
+        # Strategy-specific parameters: the (read-only) defaults merged with overrides
+        self.params = {**self._get_default_params(), **kwargs}
+        self._update_derived_params()
         
     @abstractmethod
-    def _get_default_params(self) -> Dict[str, Any]:
-        """Get default parameters for this strategy"""
+    def _get_default_params(self) -> Mapping[str, Any]:
+        """Get default parameters for this strategy (a shared read-only mapping)"""
+        pass
+        
+    def _update_derived_params(self):
+        """Precompute values derived from params; called on init and by set_parameters"""
         pass
         
     @abstractmethod
-    def analyze(self, price_data: List[float], current_price: float, 
+    def analyze(self, price_data: PriceSeries, current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """
         Analyze market data and return trading signal
         
         Args:
-            price_data: List of historical prices
+            price_data: Historical prices (list or float64 ndarray)
             current_price: Current market price
             volume_data: Optional volume data
             
@@ -67,6 +165,9 @@ class BaseStrategy(ABC):
     def set_parameters(self, **params):
         """Update strategy parameters"""
         self.params.update(params)
+        self._update_derived_params()
+        self._hold_signal = None  # Computed under the old parameters
+        self._last_series.clear()  # Likewise the incremental states: rebuild them on the next call
         self.logger.info(f"Updated {self.name} parameters: {params}")
     
     def get_parameters(self) -> Dict[str, Any]:
@@ -89,9 +190,6 @@ class BaseStrategy(ABC):
     def add_to_history(self, signal: TradingSignal):
         """Add signal to history for backtesting/analysis"""
         self.history.append(signal)
-        # Keep only last 1000 signals to prevent memory issues
-        if len(self.history) > 1000:
-            self.history = self.history[-1000:]
     
     def get_performance_metrics(self) -> Dict[str, float]:
         """Calculate basic performance metrics from signal history"""
@@ -104,11 +202,16 @@ class BaseStrategy(ABC):
             }
             
         total_signals = len(self.history)
-        total_confidence = sum(signal.confidence for signal in self.history)
+        total_confidence = 0.0
         
-        # Count signal types (simplified win rate calculation based on direction)
-        buy_signals = sum(1 for signal in self.history if signal.signal_type == "BUY")
-        sell_signals = sum(1 for signal in signal in self.history if signal.signal_type == "SELL")
+        # Count signal types (simplified win rate calculation based on direction) in one pass
+        buy_signals = sell_signals = 0
+        for signal in self.history:
+            total_confidence += signal.confidence
+            if signal.signal_type == "BUY":
+                buy_signals += 1
+            elif signal.signal_type == "SELL":
+                sell_signals += 1
         
         metrics = {
             "total_signals": total_signals,
@@ -120,9 +223,74 @@ class BaseStrategy(ABC):
         
         return metrics
     
-    def validate_data(self, price_data: List[float], min_periods: int = 20) -> bool:
+    def _cached_hold(self, price_data: PriceSeries, current_price: float) -> Optional[TradingSignal]:
+        """The last HOLD signal, if the series grew by at most one price and the price has barely moved"""
+        if self._series_step('hold', price_data) is None:
+            self._hold_signal = None  # Computed for another series
+            return None
+        signal = self._hold_signal
+        if (signal is not None
+                and abs(current_price - self._hold_price) < self.hold_tolerance * abs(self._hold_price)):
+            return signal
+        return None
+    
+    def _remember_hold(self, signal: TradingSignal, price_data: PriceSeries, current_price: float) -> TradingSignal:
+        """Keep signal for _cached_hold if it is a HOLD; returns it (price_data was recorded by _cached_hold)"""
+        if signal.signal_type == "HOLD":
+            self._hold_signal, self._hold_price = signal, current_price
+        else:
+            self._hold_signal = None
+        return signal
+    
+    def _series_step(self, key: str, prices: PriceSeries) -> Optional[int]:
+        """
+        How prices relates to the series last passed under key: 0 if it is the same
+        series, 1 if it is that series plus exactly one new price, None otherwise
+        
+        The series is matched by a fingerprint (length, first price and a copy of the
+        last few prices), so the check is O(1) however long the history grows. That
+        tells repeated calls, equal copies, rolling windows and edits to the ends of a
+        series apart from a genuine new tick; an in-place edit elsewhere needs a new
+        series. Incremental states fold a step only for 1.
+        """
+        arr = self.as_array(prices)
+        n = len(arr)
+        first = float(arr[0]) if n else None
+        last = self._last_series.get(key)
+        self._last_series[key] = (n, first, arr[max(n - _FINGERPRINT_TAIL, 0):].copy())
+        if last is None or first != last[1]:
+            return None
+        last_n, _, tail = last
+        if n == last_n and np.array_equal(arr[n - len(tail):], tail):
+            return 0
+        if n == last_n + 1 and np.array_equal(arr[n - 1 - len(tail):n - 1], tail):
+            return 1
+        return None
+    
+    def as_array(self, price_data: PriceSeries) -> np.ndarray:
+        """Price data as a contiguous float64 array (no copy for a float64 ndarray or a PriceBuffer)"""
+        if isinstance(price_data, PriceBuffer):
+            return price_data.view()
+        return np.ascontiguousarray(price_data, dtype=np.float64)
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """
+        Analyze N price series of equal length at once
+        
+        Args:
+            price_matrix: (N, T) array, one price series per row
+            current_prices: (N,) array of current market prices
+            
+        Returns:
+            One TradingSignal per row. This default analyzes row by row;
+            strategies override it with a vectorized version.
+        """
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        return [self.analyze(row, float(current)) for row, current in zip(prices, current_prices)]
+    
+    def validate_data(self, price_data: PriceSeries, min_periods: int = 20) -> bool:
         """Validate input data quality"""
-        if not price_data:
+        if len(price_data) == 0:
             self.logger.warning("No price data provided")
             return False
             
@@ -130,11 +298,41 @@ class BaseStrategy(ABC):
             self.logger.warning(f"Insufficient data: {len(price_data)} < {min_periods}")
             return False
             
-        if any(price <= 0 for price in price_data):
+        # One vectorized pass over the float64 array
+        if (self.as_array(price_data) <= 0).any():
             self.logger.warning("Invalid price data contains non-positive values")
             return False
-            
+        
         return True
     
+    def validate_batch(self, price_matrix: np.ndarray, min_periods: int = 20) -> np.ndarray:
+        """validate_data for every row of an (N, T) price matrix, as a boolean mask (one warning per batch)"""
+        if price_matrix.shape[1] < min_periods:
+            self.logger.warning(f"Insufficient data: {price_matrix.shape[1]} < {min_periods}")
+            return np.zeros(len(price_matrix), dtype=bool)
+        
+        valid = (price_matrix > 0).all(axis=1)
+        if not valid.all():
+            self.logger.warning(f"Invalid price data contains non-positive values in {int((~valid).sum())} of {len(valid)} rows")
+        return valid
+    
     def __str__(self):
-        return f"{self.name} ({self.token}) - {self.get_signal_type()}"
\ No newline at end of file
+        return f"{self.name} ({self.token}) - {self.get_signal_type()}"
+
+
+def analyze_many(strategies: List[BaseStrategy], price_data: PriceSeries, current_price: float,
+                 volume_data: Optional[List[float]] = None) -> List[TradingSignal]:
+    """
+    Run several strategies over the same price series
+    
+    The series is converted to a float64 array once and shared: each strategy's
+    analyze then uses it without a copy, instead of converting the list itself.
+    
+    Returns:
+        One TradingSignal per strategy, in the order of strategies
+    """
+    if isinstance(price_data, PriceBuffer):
+        prices = price_data.view()
+    else:
+        prices = np.ascontiguousarray(price_data, dtype=np.float64)
+    return [strategy.analyze(prices, current_price, volume_data) for strategy in strategies]
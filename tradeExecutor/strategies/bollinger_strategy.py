@@ -3,21 +3,62 @@ Bollinger Bands Trading Strategy
 Implements volatility-based trading using price bands
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
+from types import MappingProxyType
+from collections import deque
+import math
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Signal, fixed confidence and reason template for each Bollinger decision branch;
+# a None confidence scales with the breakout
+_BB_BRANCHES = (
+    ("HOLD", 0.0), ("SELL", None), ("BUY", None), ("SELL", 0.6), ("BUY", 0.6),
+    ("SELL", 0.4), ("BUY", 0.4), ("HOLD", 0.3), ("SELL", 0.2), ("BUY", 0.2)
+)
+_BB_BRANCH_REASONS = (
+    "Price within normal range",
+    "Strong upper band breakout: Price ${:.2f} vs Upper Band ${:.2f}",
+    "Strong lower band breakout: Price ${:.2f} vs Lower Band ${:.2f}",
+    "Price bouncing off upper band: ${:.2f} vs Upper Band ${:.2f}",
+    "Price bouncing off lower band: ${:.2f} vs Lower Band ${:.2f}",
+    "Band squeeze near resistance: {:.2f}",
+    "Band squeeze near support: {:.2f}",
+    "Band squeeze pattern detected, awaiting breakout",
+    "Price approaching from above Middle Band: ${:.2f}",
+    "Price approaching from below Middle Band: ${:.2f}",
+)
+
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'period': 20,  # SMA period
+    'std_dev': 2.0,  # Standard deviation multipliers
+    'band_width_threshold': 0.02,  # Minimum band width
+    'breakout_strength': 0.01,  # How far beyond bands to consider breakout
+    'use_squeeze': True  # Trade band squeeze releases
+})
+
 class BollingerBandsStrategy(BaseStrategy):
     """Bollinger Bands-based volatility strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'period': 20,  # SMA period
-            'std_dev': 2.0,  # Standard deviation multipliers
-            'band_width_threshold': 0.02,  # Minimum band width
-            'breakout_strength': 0.01,  # How far beyond bands to consider breakout
-            'use_squeeze': True  # Trade band squeeze releases
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
+    
+    # Sliding window and running sums carried between analyze() calls. Sums are kept
+    # relative to _shift so sumsq/N - mean^2 doesn't cancel catastrophically at high prices;
+    # every `period` slides they are recomputed from the window and _shift is re-anchored
+    # to the latest price, so rounding drift doesn't accumulate as the price trends away.
+    _window: Optional[deque] = None
+    _shift: float = 0.0
+    _sum: float = 0.0
+    _sumsq: float = 0.0
+    _slides: int = 0
+    
+    # Last bands and mean recent band width, reused while analyze sees the same series
+    # (matched by value through BaseStrategy._series_step)
+    _bands: Optional[Dict[str, float]] = None
+    _avg_width: Optional[float] = None
     
     def get_signal_type(self) -> str:
         return "volatility"
@@ -25,7 +66,7 @@ class BollingerBandsStrategy(BaseStrategy):
     def calculate_bollinger_bands(self, prices: List[float]) -> Dict[str, float]:
         """Calculate Bollinger Bands"""
         if len(prices) < self.params['period']:
-            current_price = prices[-1] if prices else 0.0
+            current_price = prices[-1] if len(prices) else 0.0
             return {
                 'upper': current_price * 1.02,
                 'middle': current_price,
@@ -35,16 +76,57 @@ class BollingerBandsStrategy(BaseStrategy):
                 'sma': current_price
             }
         
-        recent_prices = prices[-self.params['period']:]
+        recent = self.as_array(prices)[-self.params['period']:]
+        
+        # Simple Moving Average (middle band) and population standard deviation
+        sma = float(recent.mean())
+        std_dev = float(recent.std())
         
-        # Simple Moving Average (middle band)
-        sma = sum(recent_prices) / len(recent_prices)
+        return self._build_bands(sma, std_dev)
+    
+    def update_bollinger_bands(self, prices: List[float]) -> Dict[str, float]:
+        """Bollinger Bands, updated in O(1) when prices adds one point to the previous call's data"""
+        step = self._series_step('bollinger', prices)
+        if self._bands is not None and step == 0:
+            return dict(self._bands)  # Same series as last call; the window is already up to date
         
-        # Standard Deviation
-        squared_diffs = [(price - sma) ** 2 for price in recent_prices]
-        std_dev = (sum(squared_diffs) / len(recent_prices)) ** 0.5
+        period = self.params['period']
+        window = self._window
+        if window is not None and window.maxlen == period and step == 1:
+            # Slide the window: the oldest price leaves, the newest enters
+            latest = float(prices[-1])
+            old, new = window[0] - self._shift, latest - self._shift
+            window.append(latest)
+            self._slides += 1
+            if self._slides >= period:
+                self._reset_sums(np.array(window))
+            else:
+                self._sum += new - old
+                self._sumsq += new * new - old * old
+        elif len(prices) >= period:
+            # Fresh data that doesn't continue the window: recompute the sums
+            recent = self.as_array(prices)[-period:]
+            self._window = deque(recent.tolist(), maxlen=period)
+            self._reset_sums(recent)
+        else:
+            self._window = self._bands = None
+            return self.calculate_bollinger_bands(prices)
         
-        # Bollinger Bands
+        mean = self._sum / period
+        std_dev = math.sqrt(max(self._sumsq / period - mean * mean, 0.0))
+        self._bands = self._build_bands(self._shift + mean, std_dev)
+        return dict(self._bands)  # A copy: callers may modify it without touching the cached bands
+    
+    def _reset_sums(self, recent: np.ndarray):
+        """Recompute the running sums over the window, anchored at its latest price"""
+        self._shift = float(recent[-1])
+        shifted = recent - self._shift
+        self._sum = float(shifted.sum())
+        self._sumsq = float(shifted @ shifted)
+        self._slides = 0
+    
+    def _build_bands(self, sma: float, std_dev: float) -> Dict[str, float]:
+        """Band levels around the SMA"""
         upper_band = sma + (self.params['std_dev'] * std_dev)
         lower_band = sma - (self.params['std_dev'] * std_dev)
         
@@ -75,18 +157,22 @@ class BollingerBandsStrategy(BaseStrategy):
         if len(prices) < 20:
             return False
         
-        recent_widths = []
-        for i in range(len(prices) - 19, len(prices)):
-            period_prices = prices[max(0, i-19):i+1]
-            if len(period_prices) >= self.params['period']:
-                bb_data = self.calculate_bollinger_bands(period_prices)
-                recent_widths.append(bb_data['width'])
+        # Windows are capped at 20 prices, so longer periods never produce a width
+        if self.params['period'] > 20:
+            return False
+        
+        if self._series_step('squeeze', prices) != 0:
+            # Widths of the bands ending at each of the last 19 prices, from one rolling std
+            period = self.params['period']
+            recent = self.as_array(prices)[-(19 + period - 1):]
+            recent_widths = 2 * self.params['std_dev'] * sliding_window_view(recent, period).std(axis=1)
+            self._avg_width = float(recent_widths.mean()) if len(recent_widths) >= 6 else None
         
-        if len(recent_widths) < 6:
+        avg_recent_width = self._avg_width
+        if avg_recent_width is None:
             return False
         
         current_width = band_width
-        avg_recent_width = sum(recent_widths) / len(recent_widths)
         
         # Squeeze if current width is significantly smaller than recent average
         return current_width < (avg_recent_width * self.params['band_width_threshold'])
@@ -94,7 +180,13 @@ class BollingerBandsStrategy(BaseStrategy):
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using Bollinger Bands"""
-        if not self.validate_data(price_data, min_periods=self.params['period']):
+        # Work on the float64 array from here on; slices below are views
+        prices = self.as_array(price_data)
+        cached = self._cached_hold(prices, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
+        if not self.validate_data(prices, min_periods=self.params['period']):
             return TradingSignal(
                 signal_type="HOLD",
                 confidence=0.0,
@@ -102,7 +194,7 @@ class BollingerBandsStrategy(BaseStrategy):
             )
         
         # Calculate Bollinger Bands
-        bb_data = self.calculate_bollinger_bands(price_data)
+        bb_data = self.update_bollinger_bands(prices)
         
         # Determine signal based on price relative to bands
         price_position = self.calculate_bollinger_divergence(
@@ -112,67 +204,54 @@ class BollingerBandsStrategy(BaseStrategy):
         # Band width for squeeze detection
         band_width = bb_data['width']
         
-        # Trading signals based on Bollinger Bands rules
-        signal_type = "HOLD"
-        confidence = 0.0
-        reason = "Price within normal range"
+        # Detect the squeeze once; it feeds both the signal logic and the metadata
+        squeeze_detected = self.params['use_squeeze'] and self.detect_squeeze(band_width, prices)
+        
+        # Trading signals based on Bollinger Bands rules; each rule selects a branch of
+        # _BB_BRANCHES, and the reason is formatted lazily from its template
+        breakout_confidence = None
+        branch = 0  # Price within normal range
         
         # Upper band breakout - potential sell signal
         if current_price >= bb_data['upper'] * (1 + self.params['breakout_strength']):
-            signal_type = "SELL"
-            confidence = min((current_price - bb_data['upper']) / bb_data['std_dev'], 1.0)
-            reason = f"Strong upper band breakout: Price ${current_price:.2f} vs Upper Band ${bb_data['upper']:.2f}"
+            branch = 1
+            breakout_confidence = min((current_price - bb_data['upper']) / bb_data['std_dev'], 1.0)
         
         # Lower band breakout - potential buy signal  
         elif current_price <= bb_data['lower'] * (1 - self.params['breakout_strength']):
-            signal_type = "BUY"
-            confidence = min((bb_data['lower'] - current_price) / bb_data['std_dev'], 1.0)
-            reason = f"Strong lower band breakout: Price ${current_price:.2f} vs Lower Band ${bb_data['lower']:.2f}"
+            branch = 2
+            breakout_confidence = min((bb_data['lower'] - current_price) / bb_data['std_dev'], 1.0)
         
         # Bounce off upper band - moderate sell signal
         elif current_price > bb_data['upper']:
-            signal_type = "SELL"
-            confidence = 0.6
-            reason = f"Price bouncing off upper band: ${current_price:.2f} vs Upper Band ${bb_data['upper']:.2f}"
+            branch = 3
         
         # Bounce off lower band - moderate buy signal
         elif current_price < bb_data['lower']:
-            signal_type = "BUY"
-            confidence = 0.6
-            reason = f"Price bouncing off lower band: ${current_price:.2f} vs Lower Band ${bb_data['lower']:.2f}"
+            branch = 4
         
         # Squeeze detection
-        elif self.params['use_squeeze'] and self.detect_squeeze(band_width, price_data):
+        elif squeeze_detected:
             if price_position > 0.8:  # Near upper end of squeeze
-                signal_type = "SELL"
-                confidence = 0.4
-                reason = f"Band squeeze near resistance: {price_position:.2f}"
+                branch = 5
             elif price_position < 0.2:  # Near lower end of squeeze
-                signal_type = "BUY"
-                confidence = 0.4
-                reason = f"Band squeeze near support: {price_position:.2f}"
+                branch = 6
             else:
-                signal_type = "HOLD"
-                confidence = 0.3
-                reason = "Band squeeze pattern detected, awaiting breakout"
+                branch = 7  # Awaiting breakout
         
         # Mid-band crossover
-        else:
-            if price_position > 0.5:
-                if abs(current_price - bb_data['middle']) / bb_data['std_dev'] < 0.5:
-                    signal_type = "SELL"
-                    confidence = 0.2
-                    reason = f"Price approaching from above Middle Band: ${current_price:.2f}"
-            else:
-                if abs(current_price - bb_data['middle']) / bb_data['std_dev'] < 0.5:
-                    signal_type = "BUY"
-                    confidence = 0.2
-                    reason = f"Price approaching from below Middle Band: ${current_price:.2f}"
+        elif abs(current_price - bb_data['middle']) / bb_data['std_dev'] < 0.5:
+            branch = 8 if price_position > 0.5 else 9
         
-        return TradingSignal(
+        signal_type, confidence = _BB_BRANCHES[branch]
+        if breakout_confidence is not None:
+            confidence = breakout_confidence
+        
+        signal = TradingSignal(
             signal_type=signal_type,
             confidence=confidence,
-            reason=reason,
+            reason=_BB_BRANCH_REASONS[branch],
+            reason_args=self._reason_args(branch, current_price, bb_data['upper'], bb_data['lower'], price_position),
             metadata={
                 'current_position': price_position,
                 'band_width': band_width,
@@ -182,9 +261,102 @@ class BollingerBandsStrategy(BaseStrategy):
                     'middle': bb_data['middle'],
                     'lower': bb_data['lower']
                 },
-                'squeeze_detected': self.detect_squeeze(band_width, price_data) if self.params['use_squeeze'] else False
+                'squeeze_detected': squeeze_detected
             }
         )
+        return self._remember_hold(signal, prices, current_price)
+    
+    def _reason_args(self, branch: int, current_price: float, upper: float, lower: float,
+                     price_position: float) -> tuple:
+        """Arguments for the reason template of a Bollinger decision branch"""
+        if branch in (1, 3):
+            return (current_price, upper)
+        if branch in (2, 4):
+            return (current_price, lower)
+        if branch in (5, 6):
+            return (price_position,)
+        if branch in (8, 9):
+            return (current_price,)
+        return ()
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix"""
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        current = np.asarray(current_prices, dtype=np.float64)
+        period = self.params['period']
+        length = prices.shape[1]
+        valid = self.validate_batch(prices, min_periods=period)
+        if not valid.any():
+            return [TradingSignal(signal_type="HOLD", confidence=0.0,
+                                  reason="Insufficient data for Bollinger Bands calculation")
+                    for _ in range(len(prices))]
+        
+        # Bands for every row at once
+        recent = prices[:, -period:]
+        sma = recent.mean(axis=1)
+        std_dev = recent.std(axis=1)
+        upper = sma + self.params['std_dev'] * std_dev
+        lower = sma - self.params['std_dev'] * std_dev
+        band_width = upper - lower
+        
+        # Squeeze: current width vs the mean width of the last 19 windows (as detect_squeeze)
+        squeeze = np.zeros(len(prices), dtype=bool)
+        if self.params['use_squeeze'] and length >= 20 and period <= 20:
+            windows = sliding_window_view(prices[:, -(19 + period - 1):], period, axis=1)
+            widths = 2 * self.params['std_dev'] * windows.std(axis=2)
+            if widths.shape[1] >= 6:
+                squeeze = band_width < widths.mean(axis=1) * self.params['band_width_threshold']
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_position = np.select(
+                [current >= upper, current <= lower], [1.0, 0.0],
+                default=(current - lower) / (upper - lower)
+            )
+            near_middle = np.abs(current - sma) / std_dev < 0.5
+            branch = np.select([
+                current >= upper * (1 + self.params['breakout_strength']),
+                current <= lower * (1 - self.params['breakout_strength']),
+                current > upper,
+                current < lower,
+                squeeze & (price_position > 0.8),
+                squeeze & (price_position < 0.2),
+                squeeze,
+                (price_position > 0.5) & near_middle,
+                (price_position <= 0.5) & near_middle,
+            ], [1, 2, 3, 4, 5, 6, 7, 8, 9], default=0)
+            breakout_confidence = np.minimum(
+                np.where(branch == 1, current - upper, lower - current) / std_dev, 1.0
+            )
+        
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i]:
+                # The HOLD analyze returns, built directly: analyze would touch the incremental state
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for Bollinger Bands calculation"
+                ))
+                continue
+            signal_type, confidence = _BB_BRANCHES[branch[i]]
+            signals.append(TradingSignal(
+                signal_type=signal_type,
+                confidence=float(breakout_confidence[i]) if confidence is None else confidence,
+                reason=_BB_BRANCH_REASONS[branch[i]],
+                reason_args=self._reason_args(branch[i], current[i], upper[i], lower[i], price_position[i]),
+                metadata={
+                    'current_position': float(price_position[i]),
+                    'band_width': float(band_width[i]),
+                    'std_dev': float(std_dev[i]),
+                    'bands': {
+                        'upper': float(upper[i]),
+                        'middle': float(sma[i]),
+                        'lower': float(lower[i])
+                    },
+                    'squeeze_detected': bool(squeeze[i])
+                }
+            ))
+        return signals
     
     def get_band_levels(self) -> Dict[str, Dict[str, int or float]]:
         """Get Bollinger Bands parameter levels"""
@@ -218,26 +390,26 @@ class BollingerBandsStrategy(BaseStrategy):
         """
 
 # Example Bollinger Bands configurations
-BOLLINGER_CONFIGS = {
-    'standard': {
+BOLLINGER_CONFIGS = MappingProxyType({
+    'standard': MappingProxyType({
         'period': 20,
         'std_dev': 2.0,
         'band_width_threshold': 0.15,
         'breakout_strength': 0.01,
         'use_squeeze': True
-    },
-    'conservative': {
+    }),
+    'conservative': MappingProxyType({
         'period': 25,
         'std_dev': 2.5,
         'band_width_threshold': 0.10,
         'breakout_strength': 0.02,
         'use_squeeze': True
-    },
-    'aggressive': {
+    }),
+    'aggressive': MappingProxyType({
         'period': 12,
         'std_dev': 1.5,
         'band_width_threshold': 0.20,
         'breakout_strength': 0.005,
         'use_squeeze': False
-    }
-}
\ No newline at end of file
+    })
+})
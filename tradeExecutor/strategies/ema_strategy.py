@@ -3,37 +3,76 @@ Exponential Moving Average (EMA) Trading Strategy
 More responsive moving average using exponential weighting
 """
 
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Mapping, Optional
+from types import MappingProxyType
+import numpy as np
+from ._njit import njit, JIT_ENABLED
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'period': 12,
+    'multiplier': 0.15,  # More responsive than simple averages
+    'comparison_period': 26,  # For EMA crossover approach
+    'buffer_percentage': 0.01,
+    'alpha_factor': 1.0  # Additional responsiveness factor
+})
+
+@lru_cache(maxsize=32)
+def _ema_weights(steps: int, alpha: float) -> np.ndarray:
+    """Weights w such that w @ [seed, x_1..x_steps] is the EMA after `steps` updates (read-only: shared by the cache)"""
+    decay = 1 - alpha
+    weights = np.concatenate(([decay ** steps], alpha * decay ** np.arange(steps - 1, -1, -1)))
+    weights.setflags(write=False)
+    return weights
+
+@njit("float64(float64[::1], int64, float64)", cache=True)
+def _ema_last(prices, period, alpha):
+    """EMA seeded with the first price and updated over the most recent `period` prices"""
+    ema = prices[0]
+    for i in range(max(len(prices) - period, 1), len(prices)):
+        ema += alpha * (prices[i] - ema)  # LERP form of alpha * x + (1 - alpha) * ema (equal up to rounding)
+    return ema
+
 class EMAStrategy(BaseStrategy):
     """Exponential Moving Average trend-following strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'period': 12,
-            'multiplier': 0.15,  # More responsive than simple averages
-            'comparison_period': 26,  # For EMA crossover approach
-            'buffer_percentage': 0.01,
-            'alpha_factor': 1.0  # Additional responsiveness factor
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
     
     def get_signal_type(self) -> str:
         return "trend"
     
+    def _update_derived_params(self):
+        """Smoothing factor and full-window EMA weights for the short and long periods"""
+        self._alphas = {
+            period: min(2 / (period + 1) * self.params['alpha_factor'], 1.0)
+            for period in (self.params['period'], self.params['comparison_period'])
+        }
+        self._weights = {period: _ema_weights(period, alpha) for period, alpha in self._alphas.items()}
+    
     def calculate_ema(self, prices: List[float], period: int) -> float:
         """Calculate Exponential Moving Average (returns latest value)"""
-        if not prices or period <= 0:
-            return prices[-1] if prices else 0.0
+        if len(prices) == 0 or period <= 0:
+            return prices[-1] if len(prices) else 0.0
         
-        alpha = 2 / (period + 1)
-        adjusted_alpha = min(alpha * self.params['alpha_factor'], 1.0)
+        adjusted_alpha = self._alphas.get(period)
+        if adjusted_alpha is None:
+            adjusted_alpha = min(2 / (period + 1) * self.params['alpha_factor'], 1.0)
         
-        ema = prices[0]
-        for price in prices[1:][-period:]:  # Use only recent values
-            ema = (price * adjusted_alpha) + ema * (1 - adjusted_alpha)
+        arr = self.as_array(prices)
+        if JIT_ENABLED:
+            return _ema_last(arr, period, adjusted_alpha)
         
-        return ema
+        # Seeded with the first price, then updated over the most recent `period` values:
+        # the unrolled recurrence is a single dot product with geometric weights
+        # (the seed term is split off so the recent prices are a view, not a copy)
+        steps = min(period, len(arr) - 1)
+        weights = self._weights.get(period) if steps == period else None
+        if weights is None:
+            weights = _ema_weights(steps, adjusted_alpha)
+        return float(weights[0] * arr[0] + weights[1:] @ arr[len(arr) - steps:])
     
     def calculate_weighted_price_trend(self, prices: List[float]) -> Dict[str, float]:
         """Use EMA to calculate trend direction and strength"""
@@ -45,7 +84,7 @@ class EMAStrategy(BaseStrategy):
         long_ema = self.calculate_ema(prices, self.params['comparison_period'])
         
         # Price relative to EMAs
-        current_price = prices[-1] if prices else 0.0
+        current_price = prices[-1] if len(prices) else 0.0
         
         # Calculate momentum based on EMA relationships
         trend_strength = (short_ema - long_ema) / long_ema if long_ema > 0 else 0.0
@@ -68,6 +107,11 @@ class EMAStrategy(BaseStrategy):
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using EMA strategy"""
+        price_data = self.as_array(price_data)  # One conversion serves the whole analysis
+        cached = self._cached_hold(price_data, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
         if not self.validate_data(price_data, min_periods=max(self.params['period'], self.params['comparison_period'])):
             return TradingSignal(
                 signal_type="HOLD",
@@ -77,7 +121,51 @@ class EMAStrategy(BaseStrategy):
         
         # Calculate EMA indicators
         ema_data = self.calculate_weighted_price_trend(price_data)
+        return self._remember_hold(self._ema_signal(ema_data, current_price), price_data, current_price)
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix"""
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        current = np.asarray(current_prices, dtype=np.float64)
+        length = prices.shape[1]
+        valid = self.validate_batch(prices, min_periods=max(self.params['period'], self.params['comparison_period']))
+        if not valid.any():
+            return [TradingSignal(signal_type="HOLD", confidence=0.0, reason="Insufficient data for EMA calculation")
+                    for _ in range(len(prices))]
         
+        # Short and long EMAs for every row: each a matrix-vector product with the EMA weights
+        emas = []
+        for period in (self.params['period'], self.params['comparison_period']):
+            steps = min(period, length - 1)
+            weights = self._weights[period] if steps == period else _ema_weights(steps, self._alphas[period])
+            emas.append(weights[0] * prices[:, 0] + prices[:, length - steps:] @ weights[1:])
+        short_ema, long_ema = emas
+        last_price = prices[:, -1]
+        trend = (short_ema - long_ema) / long_ema
+        momentum = (last_price - short_ema) / last_price
+        
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i]:
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for EMA calculation"
+                ))
+                continue
+            signals.append(self._ema_signal({
+                'trend': float(trend[i]),
+                'momentum': float(momentum[i]),
+                'support': float(long_ema[i]) * (1 - self.params['buffer_percentage']),
+                'resistance': float(short_ema[i]) * (1 + self.params['buffer_percentage']),
+                'short_ema': float(short_ema[i]),
+                'long_ema': float(long_ema[i]),
+                'current_price': float(last_price[i])
+            }, float(current[i])))
+        return signals
+    
+    def _ema_signal(self, ema_data: Dict[str, float], current_price: float) -> TradingSignal:
+        """Signal for the EMA trend data of calculate_weighted_price_trend"""
         trend_strength = ema_data['trend']
         price_momentum = ema_data['momentum']
         
@@ -85,46 +173,54 @@ class EMAStrategy(BaseStrategy):
         signal_type = "HOLD"
         confidence = 0.0
         reason = "Neutral market conditions"
+        reason_args = None  # Formatted into reason only when it is read
         
         # Strong bull trend with price above EMAs
         if trend_strength > 0.01 and price_momentum > 0:
             signal_type = "BUY"
             confidence = min(abs(trend_strength) * 25 + abs(price_momentum) * 50, 1.0)
-            reason = f"Bullish EMA crossover: Short={ema_data['short_ema']:.2f}, Long={ema_data['long_ema']:.2f}, Trend={trend_strength*100:.1f}%"
+            reason = "Bullish EMA crossover: Short={:.2f}, Long={:.2f}, Trend={:.1f}%"
+            reason_args = (ema_data['short_ema'], ema_data['long_ema'], trend_strength * 100)
         
         # Strong bear trend with price below EMAs
         elif trend_strength < -0.01 and price_momentum < 0:
             signal_type = "SELL"
             confidence = min(abs(trend_strength) * 25 + abs(price_momentum) * 50, 1.0)
-            reason = f"Bearish EMA crossover: Short={ema_data['short_ema']:.2f}, Long={ema_data['long_ema']:.2f}, Trend={trend_strength*100:.1f}%"
+            reason = "Bearish EMA crossover: Short={:.2f}, Long={:.2f}, Trend={:.1f}%"
+            reason_args = (ema_data['short_ema'], ema_data['long_ema'], trend_strength * 100)
         
         # EMA support/resistance bounce
-        elif abs(current_price - ema_data['long_ema']) / current_price < 0.005:
+        elif abs(current_price - ema_data['long_ema']) < 0.005 * current_price:  # Within 0.5% of the price
             # Price near long EMA - potential bounce
             if ema_data['trend'] > 0:
                 signal_type = "BUY"
                 confidence = 0.4
-                reason = f"Price bouncing from EMA support: ${current_price:.2f}"
+                reason = "Price bouncing from EMA support: ${:.2f}"
+                reason_args = (current_price,)
             else:
                 signal_type = "SELL"
                 confidence = 0.4
-                reason = f"Price testing EMA resistance: ${current_price:.2f}"
+                reason = "Price testing EMA resistance: ${:.2f}"
+                reason_args = (current_price,)
         
         # Momentum continuation
         else:
             if ema_data['trend'] > 0 and current_price > ema_data['short_ema']:
                 signal_type = "HOLD"
                 confidence = 0.3
-                reason = f"Trend continuation: ${current_price:.2f} above EMAs"
+                reason = "Trend continuation: ${:.2f} above EMAs"
+                reason_args = (current_price,)
             elif ema_data['trend'] < 0 and current_price < ema_data['short_ema']:
                 signal_type = "HOLD"
                 confidence = 0.3
-                reason = f"Trend continuation: ${current_price:.2f} below EMAs"
+                reason = "Trend continuation: ${:.2f} below EMAs"
+                reason_args = (current_price,)
         
         return TradingSignal(
             signal_type=signal_type,
             confidence=confidence,
             reason=reason,
+            reason_args=reason_args,
             metadata={
                 **ema_data,
                 'trend_strength_percent': trend_strength * 100,
@@ -163,23 +259,23 @@ class EMAStrategy(BaseStrategy):
         """
 
 # Example EMA configurations
-EMA_CONFIGS = {
-    'short_term': {
+EMA_CONFIGS = MappingProxyType({
+    'short_term': MappingProxyType({
         'period': 8,
         'comparison_period': 21,
         'buffer_percentage': 0.008,
         'alpha_factor': 1.2
-    },
-    'medium_term': {
+    }),
+    'medium_term': MappingProxyType({
         'period': 12,
         'comparison_period': 26,
         'buffer_percentage': 0.012,
         'alpha_factor': 1.0
-    },
-    'long_term': {
+    }),
+    'long_term': MappingProxyType({
         'period': 21,
         'comparison_period': 50,
         'buffer_percentage': 0.015,
         'alpha_factor': 0.8
-    }
-}
\ No newline at end of file
+    })
+})
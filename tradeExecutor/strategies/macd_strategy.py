@@ -3,76 +3,175 @@ MACD (Moving Average Convergence Divergence) Trading Strategy
 Implements trend-following based on MACD line and signal crossovers
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from types import MappingProxyType
+import numpy as np
+from scipy.signal import lfilter
+from ._njit import njit, JIT_ENABLED
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'fast_period': 12,
+    'slow_period': 26,
+    'signal_period': 9,
+    'histogram_threshold': 0.01,
+    'confirm_trend': True,  # Wait for multiple confirmations
+    'use_histogram': True
+})
+
+@njit("UniTuple(float64, 4)(float64[::1], int64, int64, int64)", cache=True)
+def _macd_loop(prices, fast_period, slow_period, signal_period):
+    """
+    Last (fast EMA, slow EMA, MACD, signal line) in one pass over prices
+    
+    Both EMAs advance side by side in the same loop, and the signal line is folded
+    in as each MACD value is produced. Requires fast_period <= slow_period.
+    """
+    fast_multiplier = 2 / (fast_period + 1)
+    slow_multiplier = 2 / (slow_period + 1)
+    signal_multiplier = 2 / (signal_period + 1)
+    
+    # SMA seeds; the fast EMA runs alone until the slow one is seeded
+    ema_fast = 0.0
+    for i in range(fast_period):
+        ema_fast += prices[i]
+    ema_fast /= fast_period
+    ema_slow = 0.0
+    for i in range(slow_period):
+        ema_slow += prices[i]
+        if i >= fast_period:
+            ema_fast += fast_multiplier * (prices[i] - ema_fast)
+    ema_slow /= slow_period
+    
+    # Signal line: the last MACD value until signal_period values exist, then their SMA and EMA
+    macd = ema_fast - ema_slow
+    count = 1
+    macd_sum = macd
+    signal = macd
+    for i in range(slow_period, len(prices)):
+        ema_fast += fast_multiplier * (prices[i] - ema_fast)
+        ema_slow += slow_multiplier * (prices[i] - ema_slow)
+        macd = ema_fast - ema_slow
+        if count < signal_period:
+            count += 1
+            macd_sum += macd
+            signal = macd_sum / signal_period if count == signal_period else macd
+        else:
+            signal += signal_multiplier * (macd - signal)
+    return ema_fast, ema_slow, macd, signal
+
+@njit("float64[:, ::1](float64[:, ::1], int64, int64, int64)", cache=True)
+def _macd_rows(prices, fast_period, slow_period, signal_period):
+    """_macd_loop for every row of a (N, T) price matrix, as an (N, 4) array"""
+    out = np.empty((prices.shape[0], 4))
+    for i in range(prices.shape[0]):
+        out[i, 0], out[i, 1], out[i, 2], out[i, 3] = _macd_loop(prices[i], fast_period, slow_period, signal_period)
+    return out
+
 class MACDStrategy(BaseStrategy):
     """MACD-based trend-following strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'fast_period': 12,
-            'slow_period': 26,
-            'signal_period': 9,
-            'histogram_threshold': 0.01,
-            'confirm_trend': True,  # Wait for multiple confirmations
-            'use_histogram': True
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
     
     def get_signal_type(self) -> str:
         return "trend"
     
-    def calculate_ema(self, prices: List[float], period: int) -> List[float]:
-        """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return [prices[-1] if prices else 0.0]
+    def calculate_ema(self, prices: List[float], period: int) -> np.ndarray:
+        """Calculate Exponential Moving Average (along the last axis, so one row per series for a 2-D array)"""
+        arr = self.as_array(prices)
+        if arr.shape[-1] < period:
+            return arr[..., -1:] if arr.shape[-1] else np.zeros(arr.shape[:-1] + (1,))
         
         multiplier = 2 / (period + 1)
-        ema_values = [sum(prices[:period]) / period]  # Start with SMA for first value
-        
-        for i in range(period, len(prices)):
-            current_ema = (prices[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(current_ema)
+        seed = arr[..., :period].mean(axis=-1)[..., None]  # Start with SMA for first value
         
-        return ema_values
+        # ema = price * multiplier + ema * (1 - multiplier) over the rest, as one IIR filter pass
+        tail = lfilter([multiplier], [1.0, -(1 - multiplier)], arr[..., period:], axis=-1, zi=seed * (1 - multiplier))[0]
+        return np.concatenate((seed, tail), axis=-1)
+    
+    def _update_derived_params(self):
+        """EMA smoothing factors for the fast, slow and signal periods"""
+        self._multipliers = tuple(
+            2 / (self.params[name] + 1) for name in ('fast_period', 'slow_period', 'signal_period'))
+    
+    # Last EMA values from the update_macd call, advanced in O(1) per new price
+    _macd_state: Optional[Tuple[float, float, float]] = None  # (fast EMA, slow EMA, signal line)
+    _macd_periods: Optional[Tuple[int, int, int]] = None
     
     def calculate_macd(self, prices: List[float]) -> Dict[str, float]:
         """Calculate MACD line, signal line, and histogram"""
         if len(prices) < self.params['slow_period']:
             return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
         
+        _, _, last_macd, last_signal = self._macd_streaks(prices)
+        return {
+            'macd': last_macd,
+            'signal': last_signal,
+            'histogram': last_macd - last_signal
+        }
+    
+    def update_macd(self, prices: List[float]) -> Dict[str, float]:
+        """MACD for prices, updated in O(1) when prices adds one point to the previous call's data"""
+        fast_period, slow_period, signal_period = periods = (
+            self.params['fast_period'], self.params['slow_period'], self.params['signal_period'])
+        if len(prices) < slow_period:
+            return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
+        
+        prices = self.as_array(prices)
+        step = self._series_step('macd', prices)
+        if self._macd_state is not None and self._macd_periods == periods and step == 0:
+            ema_fast, ema_slow, last_signal = self._macd_state  # Same series as last call
+            last_macd = ema_fast - ema_slow
+        # The signal line must already be past its SMA seed for a single EMA step to apply
+        elif (self._macd_state is not None and self._macd_periods == periods
+                and step == 1 and len(prices) >= slow_period + signal_period):
+            ema_fast, ema_slow, last_signal = self._macd_state
+            fast_multiplier, slow_multiplier, signal_multiplier = self._multipliers
+            price = float(prices[-1])
+            ema_fast += (price - ema_fast) * fast_multiplier
+            ema_slow += (price - ema_slow) * slow_multiplier
+            last_macd = ema_fast - ema_slow
+            last_signal += (last_macd - last_signal) * signal_multiplier
+        else:
+            ema_fast, ema_slow, last_macd, last_signal = self._macd_streaks(prices)
+            self._macd_periods = periods
+        self._macd_state = (ema_fast, ema_slow, last_signal)
+        
+        return {
+            'macd': last_macd,
+            'signal': last_signal,
+            'histogram': last_macd - last_signal
+        }
+    
+    def _macd_streaks(self, prices: List[float]) -> Tuple[float, float, float, float]:
+        """Last fast EMA, slow EMA, MACD and signal line values over the whole series"""
+        if JIT_ENABLED and self.params['fast_period'] <= self.params['slow_period']:
+            return _macd_loop(self.as_array(prices), self.params['fast_period'],
+                              self.params['slow_period'], self.params['signal_period'])
+        
         # Calculate EMAs
         ema_fast = self.calculate_ema(prices, self.params['fast_period'])
         ema_slow = self.calculate_ema(prices, self.params['slow_period'])
         
-        # Ensure we align periods correctly
+        # MACD line = EMA12 - EMA26 (aligned on the most recent values)
         min_len = min(len(ema_fast), len(ema_slow))
-        if min_len < 1:
-            return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
-        
-        # MACD line = EMA12 - EMA26 (using last values)
-        start_idx = len(ema_fast) - min_len
-        fast_values = ema_fast[-min_len:]
-        slow_values = ema_slow[-min_len:]
-        
-        macd_line = [fast - slow for fast, slow in zip(fast_values, slow_values)]
+        macd_line = ema_fast[-min_len:] - ema_slow[-min_len:]
         
         # Signal line = EMA9 of MACD line
         signal_line = self.calculate_ema(macd_line, self.params['signal_period'])
         
-        # Histogram = MACD line - Signal line
-        last_macd = macd_line[-1] if macd_line else 0.0
-        last_signal = signal_line[-1] if signal_line else 0.0
-        
-        return {
-            'macd': last_macd,
-            'signal': last_signal,
-            'histogram': last_macd - last_signal
-        }
+        return float(ema_fast[-1]), float(ema_slow[-1]), float(macd_line[-1]), float(signal_line[-1])
     
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using MACD"""
+        price_data = self.as_array(price_data)  # One conversion serves the whole analysis
+        cached = self._cached_hold(price_data, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
         if not self.validate_data(price_data, min_periods=self.params['slow_period']):
             return TradingSignal(
                 signal_type="HOLD",
@@ -81,41 +180,85 @@ class MACDStrategy(BaseStrategy):
             )
         
         # Calculate MACD
-        macd_data = self.calculate_macd(price_data)
+        macd_data = self.update_macd(price_data)
         macd_line = macd_data['macd']
         signal_line = macd_data['signal']
         histogram = macd_data['histogram']
         
-        # Determine signal based on crossovers
-        signal_type = "HOLD"
-        confidence = 0.0
-        reason = "Waiting for clear signal"
-        
-        # MACD line crossing above signal line (bullish crossover)
-        if macd_line > signal_line and abs(histogram) > self.params['histogram_threshold']:
-            # Check if it's a significant crossover
-            hist_ratio = abs(histogram) / max(abs(macd_line), abs(signal_line), 0.001)
-            confidence = min(hist_ratio * 2, 1.0)
-            
+        signal = self._macd_signal(macd_line, signal_line, histogram, current_price)
+        return self._remember_hold(signal, price_data, current_price)
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix"""
+        prices = np.ascontiguousarray(price_matrix, dtype=np.float64)
+        fast_period, slow_period, signal_period = (
+            self.params['fast_period'], self.params['slow_period'], self.params['signal_period'])
+        valid = self.validate_batch(prices, min_periods=slow_period)
+        if not valid.any():
+            return [TradingSignal(signal_type="HOLD", confidence=0.0, reason="Insufficient data for MACD calculation")
+                    for _ in range(len(prices))]
+        
+        if JIT_ENABLED and fast_period <= slow_period:
+            # One compiled loop over the rows, each a single fused pass
+            last_macd, last_signal = _macd_rows(prices, fast_period, slow_period, signal_period)[:, 2:].T
+        else:
+            # Every row's EMA recurrences run in the same filter calls, along the time axis
+            ema_fast = self.calculate_ema(prices, fast_period)
+            ema_slow = self.calculate_ema(prices, slow_period)
+            min_len = min(ema_fast.shape[1], ema_slow.shape[1])
+            macd_line = ema_fast[:, -min_len:] - ema_slow[:, -min_len:]
+            last_macd = macd_line[:, -1]
+            last_signal = self.calculate_ema(macd_line, signal_period)[:, -1]
+        
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i]:
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for MACD calculation"
+                ))
+                continue
+            macd, signal = float(last_macd[i]), float(last_signal[i])
+            signals.append(self._macd_signal(macd, signal, macd - signal, float(current_prices[i])))
+        return signals
+    
+    def _macd_signal(self, macd_line: float, signal_line: float, histogram: float,
+                     current_price: float) -> TradingSignal:
+        """Signal for the last MACD, signal line and histogram values"""
+        # Determine signal based on crossovers (|histogram| compared once)
+        threshold = self.params['histogram_threshold']
+        abs_histogram = abs(histogram)
+        reason_args = None  # Formatted into reason only when it is read
+        
+        if abs_histogram > threshold:
+            # Significant crossover: MACD above the signal line is bullish, below it bearish
+            hist_ratio = abs_histogram / max(abs(macd_line), abs(signal_line), 0.001)
+            confidence = min(hist_ratio * 2, 1.0) * 0.8  # Reduce confidence slightly for lagging indicator
             if histogram > 0:
                 signal_type = "BUY"
-                reason = f"MACD bullish crossover: MACD={macd_line:.4f}, Signal={signal_line:.4f}"
-                confidence *= 0.8  # Reduce confidence slightly for lagging indicator
+                reason = "MACD bullish crossover: MACD={:.4f}, Signal={:.4f}"
             else:
                 signal_type = "SELL"
-                reason = f"MACD bearish crossover: MACD={macd_line:.4f}, Signal={signal_line:.4f}"
-                confidence *= 0.8
+                reason = "MACD bearish crossover: MACD={:.4f}, Signal={:.4f}"
+            reason_args = (macd_line, signal_line)
         
-        elif abs(histogram) < self.params['histogram_threshold']:
+        elif abs_histogram < threshold:
             # Very close to zero, no clear trend
             signal_type = "HOLD"
             confidence = 0.1
             reason = "MACD near crossover point, waiting for confirmation"
         
+        else:
+            signal_type = "HOLD"
+            confidence = 0.0
+            reason = "Waiting for clear signal"
+        
         return TradingSignal(
             signal_type=signal_type,
             confidence=confidence,
             reason=reason,
+            reason_args=reason_args,
             metadata={
                 'macd': macd_line,
                 'signal': signal_line,
@@ -154,23 +297,23 @@ class MACDStrategy(BaseStrategy):
         """
 
 # Example MACD configurations
-MACD_CONFIGS = {
-    'standard': {
+MACD_CONFIGS = MappingProxyType({
+    'standard': MappingProxyType({
         'fast_period': 12,
         'slow_period': 26,
         'signal_period': 9,
         'histogram_threshold': 0.001
-    },
-    'fast': {
+    }),
+    'fast': MappingProxyType({
         'fast_period': 8,
         'slow_period': 21,
         'signal_period': 5,
         'histogram_threshold': 0.002
-    },
-    'slow': {
+    }),
+    'slow': MappingProxyType({
         'fast_period': 19,
         'slow_period': 39,
         'signal_period': 10,
         'histogram_threshold': 0.0005
-    }
-}
\ No newline at end of file
+    })
+})
@@ -3,48 +3,109 @@ RSI (Relative Strength Index) Trading Strategy
 Implements RSI-based momentum indicators for trading signals
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from types import MappingProxyType
+import numpy as np
+from scipy.signal import lfilter
+from ._njit import njit, JIT_ENABLED
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'period': 14,
+    'overbought': 70,
+    'oversold': 30,
+    'neutral_zone_high': 60,
+    'neutral_zone_low': 40,
+    'confirmation_bars': 1,  # Confirm signals across bars
+})
+
+@njit("UniTuple(float64, 2)(float64[::1], int64)", cache=True)
+def _wilder_loop(prices, period):
+    """Wilder-smoothed (average gain, average loss) of the price changes
+    
+    Gains and losses are split branchlessly: 0.5 * (change + |change|) equals
+    max(change, 0) exactly, and avoids mispredicted jumps on alternating ticks.
+    """
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        change = prices[i] - prices[i - 1]
+        magnitude = abs(change)
+        avg_gain += 0.5 * (magnitude + change)
+        avg_loss += 0.5 * (magnitude - change)
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, len(prices)):
+        change = prices[i] - prices[i - 1]
+        magnitude = abs(change)
+        # avg += (x - avg) / period: the Wilder step (avg * (period - 1) + x) / period, equal up to rounding
+        avg_gain += (0.5 * (magnitude + change) - avg_gain) / period
+        avg_loss += (0.5 * (magnitude - change) - avg_loss) / period
+    return avg_gain, avg_loss
+
 class RSIStrategy(BaseStrategy):
     """RSI-based momentum trading strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'period': 14,
-            'overbought': 70,
-            'oversold': 30,
-            'neutral_zone_high': 60,
-            'neutral_zone_low': 40,
-            'confirmation_bars': 1,  # Confirm signals across bars
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
     
     def get_signal_type(self) -> str:
         return "momentum"
     
+    # Wilder averages from the last update_rsi call, advanced in O(1) per new price
+    _avg_gain: Optional[float] = None
+    _avg_loss: Optional[float] = None
+    _rsi_period: Optional[int] = None
+    
     def calculate_rsi(self, prices: List[float]) -> float:
         """Calculate RSI for given price data"""
         if len(prices) < self.params['period'] + 1:
             return 50.0  # Neutral RSI if insufficient data
         
-        gains = []
-        losses = []
+        return self._rsi(*self._wilder_averages(prices))
+    
+    def update_rsi(self, prices: List[float]) -> float:
+        """RSI for prices, updated in O(1) when prices adds one point to the previous call's data"""
+        period = self.params['period']
+        if len(prices) < period + 1:
+            return 50.0  # Neutral RSI if insufficient data
+        
+        prices = self.as_array(prices)
+        step = self._series_step('rsi', prices)
+        if self._avg_gain is None or self._rsi_period != period or step is None:
+            self._avg_gain, self._avg_loss = self._wilder_averages(prices)
+            self._rsi_period = period
+        elif step == 1:
+            change = float(prices[-1] - prices[-2])
+            self._avg_gain += (max(change, 0.0) - self._avg_gain) / period
+            self._avg_loss += (max(-change, 0.0) - self._avg_loss) / period
+        return self._rsi(self._avg_gain, self._avg_loss)
+    
+    def _wilder_averages(self, prices: List[float]) -> Tuple[float, float]:
+        """Wilder-smoothed average gain and loss over the whole series"""
+        period = self.params['period']
+        if JIT_ENABLED:
+            return _wilder_loop(self.as_array(prices), period)
         
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            gains.append(max(change, 0))
-            losses.append(max(-change, 0))
+        changes = np.diff(self.as_array(prices))
+        gains = np.maximum(changes, 0.0)
+        losses = np.maximum(-changes, 0.0)
         
         # Calculate initial average gain/loss
-        period = self.params['period']
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
+        avg_gain = float(gains[:period].mean())
+        avg_loss = float(losses[:period].mean())
         
-        # Calculate RSI using smoothing
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        # Wilder smoothing avg = (avg * (period - 1) + x) / period as one IIR filter pass
+        if len(gains) > period:
+            decay = (period - 1) / period
+            avg_gain = float(lfilter([1 / period], [1.0, -decay], gains[period:], zi=[avg_gain * decay])[0][-1])
+            avg_loss = float(lfilter([1 / period], [1.0, -decay], losses[period:], zi=[avg_loss * decay])[0][-1])
         
+        return avg_gain, avg_loss
+    
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
         if avg_loss == 0:
             return 100.0
         
@@ -56,6 +117,11 @@ class RSIStrategy(BaseStrategy):
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using RSI"""
+        price_data = self.as_array(price_data)  # One conversion serves the whole analysis
+        cached = self._cached_hold(price_data, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
         if not self.validate_data(price_data, min_periods=self.params['period'] + 1):
             return TradingSignal(
                 signal_type="HOLD",
@@ -63,29 +129,68 @@ class RSIStrategy(BaseStrategy):
                 reason="Insufficient data for RSI calculation"
             )
         
-        # Calculate RSI
-        rsi = self.calculate_rsi(price_data)
+        # Calculate RSI (incrementally across consecutive ticks)
+        rsi = self.update_rsi(price_data)
+        return self._remember_hold(self._rsi_signal(rsi), price_data, current_price)
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix"""
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        period = self.params['period']
+        valid = self.validate_batch(prices, min_periods=period + 1)
+        if not valid.any():
+            return [TradingSignal(signal_type="HOLD", confidence=0.0, reason="Insufficient data for RSI calculation")
+                    for _ in range(len(prices))]
+        
+        # Wilder averages for every row at once: one filter pass along the time axis
+        changes = np.diff(prices, axis=1)
+        gains = np.maximum(changes, 0.0)
+        losses = np.maximum(-changes, 0.0)
+        avg_gain = gains[:, :period].mean(axis=1)
+        avg_loss = losses[:, :period].mean(axis=1)
+        if changes.shape[1] > period:
+            decay = (period - 1) / period
+            avg_gain = lfilter([1 / period], [1.0, -decay], gains[:, period:], axis=1,
+                               zi=(avg_gain * decay)[:, None])[0][:, -1]
+            avg_loss = lfilter([1 / period], [1.0, -decay], losses[:, period:], axis=1,
+                               zi=(avg_loss * decay)[:, None])[0][:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
         
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i]:
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for RSI calculation"
+                ))
+                continue
+            signals.append(self._rsi_signal(float(rsi[i])))
+        return signals
+    
+    def _rsi_signal(self, rsi: float) -> TradingSignal:
+        """Signal for an RSI reading"""
         # Determine signal based on RSI levels
         if rsi >= self.params['overbought']:
             # Overbought - potential sell signal
             confidence = min((rsi - self.params['overbought']) / 30, 1.0)
-            reason = f"RSI overbought at {rsi:.2f} (>= {self.params['overbought']})"
             return TradingSignal(
                 signal_type="SELL",
                 confidence=confidence,
-                reason=reason,
+                reason="RSI overbought at {:.2f} (>= {})",
+                reason_args=(rsi, self.params['overbought']),
                 metadata={"rsi": rsi, "level": "overbought"}
             )
         
         elif rsi <= self.params['oversold']:
             # Oversold - potential buy signal
             confidence = min((self.params['oversold'] - rsi) / 30, 1.0)
-            reason = f"RSI oversold at {rsi:.2f} (<= {self.params['oversold']})"
             return TradingSignal(
                 signal_type="BUY",
                 confidence=confidence,
-                reason=reason,
+                reason="RSI oversold at {:.2f} (<= {})",
+                reason_args=(rsi, self.params['oversold']),
                 metadata={"rsi": rsi, "level": "oversold"}
             )
         
@@ -96,7 +201,8 @@ class RSIStrategy(BaseStrategy):
                 return TradingSignal(
                     signal_type="HOLD",
                     confidence=0.3,
-                    reason=f"RSI in moderate overbought zone: {rsi:.2f}",
+                    reason="RSI in moderate overbought zone: {:.2f}",
+                    reason_args=(rsi,),
                     metadata={"rsi": rsi, "level": "moderate_overbought"}
                 )
             
@@ -105,7 +211,8 @@ class RSIStrategy(BaseStrategy):
                 return TradingSignal(
                     signal_type="HOLD",
                     confidence=0.3,
-                    reason=f"RSI in moderate oversold zone: {rsi:.2f}",
+                    reason="RSI in moderate oversold zone: {:.2f}",
+                    reason_args=(rsi,),
                     metadata={"rsi": rsi, "level": "moderate_oversold"}
                 )
             
@@ -114,7 +221,8 @@ class RSIStrategy(BaseStrategy):
                 return TradingSignal(
                     signal_type="HOLD",
                     confidence=0.1,
-                    reason=f"RSI in neutral zone: {rsi:.2f}",
+                    reason="RSI in neutral zone: {:.2f}",
+                    reason_args=(rsi,),
                     metadata={"rsi": rsi, "level": "neutral"}
                 )
     
@@ -139,26 +247,26 @@ class RSIStrategy(BaseStrategy):
         """
 
 # Example usage and parameter configurations
-RSI_CONFIGS = {
-    'conservative': {
+RSI_CONFIGS = MappingProxyType({
+    'conservative': MappingProxyType({
         'period': 14,
         'overbought': 75,
         'oversold': 25,
         'neutral_zone_high': 60,
         'neutral_zone_low': 40
-    },
-    'aggressive': {
+    }),
+    'aggressive': MappingProxyType({
         'period': 9,
         'overbought': 65,
         'oversold': 35,
         'neutral_zone_high': 55,
         'neutral_zone_low': 45
-    },
-    'long_term': {
+    }),
+    'long_term': MappingProxyType({
         'period': 21,
         'overbought': 70,
         'oversold': 30,
         'neutral_zone_high': 60,
         'neutral_zone_low': 40
-    }
-}
\ No newline at end of file
+    })
+})
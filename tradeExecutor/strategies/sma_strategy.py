@@ -3,20 +3,25 @@ Simple Moving Average (SMA) Trading Strategy
 Basic trend-following using price crosses above/below moving average
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
+from types import MappingProxyType
+import numpy as np
 from .base_strategy import BaseStrategy, TradingSignal
 
+# Default parameters, shared (read-only) by every instance
+_DEFAULT_PARAMS = MappingProxyType({
+    'period': 20,
+    'buffer_percentage': 0.01,  # Small buffer to avoid whipsaws
+    'use_multiple_ma': False,   # Use multiple MAs
+    'short_ma_period': 10,      # Short MA period if using multiple
+    'long_ma_period': 50         # Long MA period if using multiple
+})
+
 class SMAStrategy(BaseStrategy):
     """Simple Moving Average trend-following strategy"""
     
-    def _get_default_params(self) -> Dict[str, Any]:
-        return {
-            'period': 20,
-            'buffer_percentage': 0.01,  # Small buffer to avoid whipsaws
-            'use_multiple_ma': False,   # Use multiple MAs
-            'short_ma_period': 10,      # Short MA period if using multiple
-            'long_ma_period': 50         # Long MA period if using multiple
-        }
+    def _get_default_params(self) -> Mapping[str, Any]:
+        return _DEFAULT_PARAMS
     
     def get_signal_type(self) -> str:
         return "trend"
@@ -24,13 +29,17 @@ class SMAStrategy(BaseStrategy):
     def calculate_sma(self, prices: List[float], period: int) -> float:
         """Calculate Simple Moving Average"""
         if len(prices) < period:
-            return prices[-1] if prices else 0.0
+            return prices[-1] if len(prices) else 0.0
         
-        return sum(prices[-period:]) / period
+        return float(self.as_array(prices)[-period:].mean())
     
     def analyze_single_ma(self, price_data: List[float], current_price: float) -> TradingSignal:
         """Analyze using single moving average"""
         sma = self.calculate_sma(price_data, self.params['period'])
+        return self._single_ma_signal(sma, current_price)
+    
+    def _single_ma_signal(self, sma: float, current_price: float) -> TradingSignal:
+        """Signal for the price relative to a single SMA"""
         buffer = sma * self.params['buffer_percentage']
         
         # Check if price is significantly above/below SMA
@@ -42,7 +51,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="BUY",
                 confidence=confidence,
-                reason=f"Price ${current_price:.2f} above SMA {sma:.2f} by {deviation*100:.1f}%",
+                reason="Price ${:.2f} above SMA {:.2f} by {:.1f}%",
+                reason_args=(current_price, sma, deviation * 100),
                 metadata={
                     'sma': sma,
                     'price': current_price,
@@ -59,7 +69,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="SELL",
                 confidence=confidence,
-                reason=f"Price ${current_price:.2f} below SMA {sma:.2f} by {deviation*100:.1f}%",
+                reason="Price ${:.2f} below SMA {:.2f} by {:.1f}%",
+                reason_args=(current_price, sma, deviation * 100),
                 metadata={
                     'sma': sma,
                     'price': current_price,
@@ -74,7 +85,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="HOLD",
                 confidence=0.2,  # Low confidence when near MA
-                reason=f"Price ${current_price:.2f} close to SMA {sma:.2f} within buffer",
+                reason="Price ${:.2f} close to SMA {:.2f} within buffer",
+                reason_args=(current_price, sma),
                 metadata={
                     'sma': sma,
                     'price': current_price,
@@ -94,7 +106,10 @@ class SMAStrategy(BaseStrategy):
         
         short_ma = self.calculate_sma(price_data, self.params['short_ma_period'])
         long_ma = self.calculate_sma(price_data, self.params['long_ma_period'])
-        
+        return self._multiple_ma_signal(short_ma, long_ma, current_price)
+    
+    def _multiple_ma_signal(self, short_ma: float, long_ma: float, current_price: float) -> TradingSignal:
+        """Signal for the price relative to a short and a long SMA"""
         # Golden cross: short MA above long MA
         if short_ma > long_ma and current_price > short_ma:
             strength = (short_ma - long_ma) / long_ma
@@ -103,7 +118,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="BUY",
                 confidence=confidence,
-                reason=f"Golden cross: Short MA ${short_ma:.2f} above Long MA ${long_ma:.2f}",
+                reason="Golden cross: Short MA ${:.2f} above Long MA ${:.2f}",
+                reason_args=(short_ma, long_ma),
                 metadata={
                     'short_ma': short_ma,
                     'long_ma': long_ma,
@@ -121,7 +137,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="SELL",
                 confidence=confidence,
-                reason=f"Death cross: Short MA ${short_ma:.2f} below Long MA ${long_ma:.2f}",
+                reason="Death cross: Short MA ${:.2f} below Long MA ${:.2f}",
+                reason_args=(short_ma, long_ma),
                 metadata={
                     'short_ma': short_ma,
                     'long_ma': long_ma,
@@ -136,7 +153,8 @@ class SMAStrategy(BaseStrategy):
             return TradingSignal(
                 signal_type="HOLD",
                 confidence=0.3,
-                reason=f"MAs showing mixed signals - Short: ${short_ma:.2f}, Long: ${long_ma:.2f}",
+                reason="MAs showing mixed signals - Short: ${:.2f}, Long: ${:.2f}",
+                reason_args=(short_ma, long_ma),
                 metadata={
                     'short_ma': short_ma,
                     'long_ma': long_ma,
@@ -148,6 +166,11 @@ class SMAStrategy(BaseStrategy):
     def analyze(self, price_data: List[float], current_price: float, 
                 volume_data: Optional[List[float]] = None) -> TradingSignal:
         """Analyze market using SMA strategy"""
+        price_data = self.as_array(price_data)  # One conversion serves the whole analysis
+        cached = self._cached_hold(price_data, current_price)
+        if cached is not None:
+            return cached  # Quiet tick: nothing to recompute
+        
         if not self.validate_data(price_data, min_periods=self.params['period']):
             return TradingSignal(
                 signal_type="HOLD",
@@ -163,9 +186,47 @@ class SMAStrategy(BaseStrategy):
                     confidence=0.0,
                     reason="Insufficient data for multiple MA strategy"
                 )
-            return self.analyze_multiple_ma(price_data, current_price)
+            signal = self.analyze_multiple_ma(price_data, current_price)
         else:
-            return self.analyze_single_ma(price_data, current_price)
+            signal = self.analyze_single_ma(price_data, current_price)
+        return self._remember_hold(signal, price_data, current_price)
+    
+    def analyze_batch(self, price_matrix: np.ndarray, current_prices: np.ndarray) -> List[TradingSignal]:
+        """Vectorized analyze over the rows of price_matrix"""
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        current = np.asarray(current_prices, dtype=np.float64)
+        multiple = self.params['use_multiple_ma']
+        periods = [self.params['period']]
+        if multiple:
+            periods += [self.params['short_ma_period'], self.params['long_ma_period']]
+        valid = self.validate_batch(prices, min_periods=self.params['period'])
+        if not valid.any() or prices.shape[1] < max(periods):
+            # As analyze: a valid series too short for the multiple-MA periods gets its own reason
+            return [TradingSignal(signal_type="HOLD", confidence=0.0,
+                                  reason="Insufficient data for multiple MA strategy" if ok
+                                  else "Insufficient data for SMA calculation")
+                    for ok in valid]
+        
+        # Moving averages for every row at once
+        if multiple:
+            short_ma = prices[:, -self.params['short_ma_period']:].mean(axis=1)
+            long_ma = prices[:, -self.params['long_ma_period']:].mean(axis=1)
+        else:
+            sma = prices[:, -self.params['period']:].mean(axis=1)
+        
+        signals = []
+        for i in range(len(prices)):
+            if not valid[i]:
+                signals.append(TradingSignal(
+                    signal_type="HOLD",
+                    confidence=0.0,
+                    reason="Insufficient data for SMA calculation"
+                ))
+            elif multiple:
+                signals.append(self._multiple_ma_signal(float(short_ma[i]), float(long_ma[i]), float(current[i])))
+            else:
+                signals.append(self._single_ma_signal(float(sma[i]), float(current[i])))
+        return signals
     
     def get_ma_levels(self) -> Dict[str, int]:
         """Get MA parameter levels"""
@@ -210,25 +271,25 @@ class SMAStrategy(BaseStrategy):
             """
 
 # Example SMA configurations
-SMA_CONFIGS = {
-    'short': {
+SMA_CONFIGS = MappingProxyType({
+    'short': MappingProxyType({
         'period': 10,
         'buffer_percentage': 0.015,
         'use_multiple_ma': False
-    },
-    'medium': {
+    }),
+    'medium': MappingProxyType({
         'period': 20,
         'buffer_percentage': 0.020,
         'use_multiple_ma': False
-    },
-    'long': {
+    }),
+    'long': MappingProxyType({
         'period': 50,
         'buffer_percentage': 0.025,
         'use_multiple_ma': False
-    },
-    'golden_death_cross': {
+    }),
+    'golden_death_cross': MappingProxyType({
         'short_ma_period': 20,
         'long_ma_period': 50,
         'use_multiple_ma': True
-    }
-}
\ No newline at end of file
+    })
+})
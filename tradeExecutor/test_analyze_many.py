@@ -0,0 +1,43 @@
+"""
+Tests for strategies.analyze_many
+"""
+
+import numpy as np
+from strategies import analyze_many, PriceBuffer, RSIStrategy, SMAStrategy, EMAStrategy
+
+def _prices(n=60, seed=7):
+    rng = np.random.default_rng(seed)
+    return (100 * np.cumprod(1 + rng.normal(0, 0.01, n))).tolist()
+
+def _same(a, b):
+    return (a.signal_type, a.reason, a.confidence) == (b.signal_type, b.reason, b.confidence)
+
+def test_returns_one_signal_per_strategy_in_input_order():
+    prices = _prices()
+    strategies = [SMAStrategy("sma"), RSIStrategy("rsi"), EMAStrategy("ema")]
+    signals = analyze_many(strategies, prices, prices[-1])
+    
+    assert isinstance(signals, list)
+    assert len(signals) == len(strategies)
+    for strategy, signal in zip(strategies, signals):
+        expected = type(strategy)(strategy.name).analyze(prices, prices[-1])
+        assert _same(signal, expected)
+
+def test_keeps_strategies_that_share_a_name():
+    prices = _prices()
+    strategies = [RSIStrategy("same", period=7), RSIStrategy("same", period=21)]
+    signals = analyze_many(strategies, prices, prices[-1])
+    
+    assert len(signals) == 2
+    assert _same(signals[0], RSIStrategy("a", period=7).analyze(prices, prices[-1]))
+    assert _same(signals[1], RSIStrategy("b", period=21).analyze(prices, prices[-1]))
+
+def test_accepts_a_price_buffer():
+    prices = _prices()
+    buffer = PriceBuffer(len(prices), prices)
+    signals = analyze_many([SMAStrategy("sma")], buffer, prices[-1])
+    
+    assert _same(signals[0], SMAStrategy("sma").analyze(prices, prices[-1]))
+
+def test_no_strategies():
+    assert analyze_many([], _prices(), 100.0) == []